@@ -1,35 +1,45 @@
 import sys
+import time
 import traceback
 import math
 
-# === WEB LOGGER ADDITION ===
-class WebLogger:
-    def __init__(self, log_file="web_output.log"):
-        self.log_file = log_file
-    def write(self, msg):
-        with open(self.log_file, "a") as f:
-            f.write(msg)
-        sys.__stdout__.write(msg)
-    def flush(self):
-        pass
-sys.stdout = WebLogger()
+# === WEB LOGGER ===
+# stdout is mirrored to web_output.log by a buffered sink flushed on a background thread.
+# Spawned worker processes re-import this file as __mp_main__; only the app process may own
+# (and rotate) the logs.
+from core.log_sink import install as install_log_sink, log_event
+if __name__ == "__main__":
+    install_log_sink()
 # === END WEB LOGGER ===
 
 try:
+    from core.camera import FrameSource
     from core.detection import ObjectDetector
-    from core.narration import Narrator
+    from core.background_detection import BackgroundDetector
+    from core.detections import SOURCE_DOOR
+    from core.tracking import TrackedDetector
+    from core.motion import MotionGate
+    from core.result_cache import ResultCache
+    from core.reading import ReadingSession
+    from core.frame_stream import FramePublisher
+    from core.startup import StartupTimer, LazySubsystem, init_parallel
+    from core.narration import Narrator, PRIORITY_URGENT
     from core.voice_control import VoiceController
+    from core.intents import (
+        IntentMatcher, INTENT_READING, INTENT_FIND_OBJECT, INTENT_EXIT,
+        INTENT_READ_TEXT, INTENT_EMOTION, INTENT_REPEAT, INTENT_DESCRIBE
+    )
     from core.ocr import TextReader
     from core.utils import (
         generate_spatial_description,
-        get_position_info,
-        check_command,
         generate_object_query_response,
     )
     from core.config import (
-        DESCRIBE_COMMANDS, REPEAT_COMMANDS, EXIT_COMMANDS, WINDOW_NAME,
-        OBJECT_QUERY_KEYWORDS, QUERYABLE_OBJECTS,
-        CAMERA_INDEX, EMOTION_DETECTION_ENABLED
+        WINDOW_NAME,
+        CAMERA_INDEX, EMOTION_DETECTION_ENABLED, BACKGROUND_DETECTION_ENABLED,
+        TRACKING_ENABLED, MOTION_GATE_ENABLED, RESULT_CACHE_ENABLED,
+        STARTUP_PARALLEL, LAZY_LOAD_MODELS, PREFETCH_LAZY_MODELS, OCR_PREPROCESS,
+        WEB_FRAME_ENABLED, WORKER_PROCESSES_ENABLED, READING_STOP_TIMEOUT
     )
     from core.emotion_detection import EmotionDetector
     import cv2
@@ -39,47 +49,76 @@ except Exception as e:
     traceback.print_exc()
     sys.exit(1)
 
-def calc_center_angle(bbox, frame_width, hfov_deg=60):
-    x1, y1, x2, y2 = bbox
-    obj_center_x = (x1 + x2) / 2
-    rel_center = (obj_center_x - frame_width / 2) / (frame_width / 2)
-    angle = rel_center * (hfov_deg / 2)
-    return angle
-
-def estimate_distance_to_object(bbox, known_width=90, focal_length=580):
-    x1, y1, x2, y2 = bbox
-    width_pixels = abs(x2 - x1)
-    if width_pixels <= 0:
-        return None
-    distance_cm = (known_width * focal_length) / width_pixels
-    return distance_cm / 100  # meters
-
 class VisionAssistantApp:
     def __init__(self):
         print("\n=== Vision Assistant: Starting ===\n")
         try:
-            print("Initializing ObjectDetector...")
-            self.detector = ObjectDetector()
-            print("✅ ObjectDetector ready")
-            print("Initializing Narrator...")
-            self.narrator = Narrator()
-            print("✅ Narrator ready")
-            print("Initializing VoiceController...")
-            self.voice_ctrl = VoiceController()
-            print("✅ VoiceController ready")
-            print("Initializing TextReader...")
-            self.text_reader = TextReader()
-            print("✅ TextReader ready")
-            # EMOTION DETECTION
-            if EMOTION_DETECTION_ENABLED:
-                print("Initializing EmotionDetector...")
-                self.emotion_detector = EmotionDetector(camera_index=CAMERA_INDEX)
-                print("✅ EmotionDetector ready")
+            timer = StartupTimer()
+            print("Initializing camera...")
+            self.frame_source = timer.run("Camera", lambda: FrameSource(CAMERA_INDEX))
+            # Independent subsystems start concurrently; heavy libraries load inside each constructor
+            if WORKER_PROCESSES_ENABLED:
+                # Models run in worker processes; frames are passed through shared memory
+                from core.workers import RemoteDetector, RemoteTextReader, RemoteEmotionDetector
+                detector_factory = lambda: RemoteDetector(self.frame_source)
+                text_reader_factory = RemoteTextReader
+                emotion_factory = lambda: RemoteEmotionDetector(self.frame_source)
             else:
-                self.emotion_detector = None
+                detector_factory = lambda: ObjectDetector(frame_source=self.frame_source)
+                text_reader_factory = TextReader
+                emotion_factory = lambda: EmotionDetector(frame_source=self.frame_source)
+            factories = {
+                "ObjectDetector": detector_factory,
+                "Narrator": Narrator,
+                "VoiceController": VoiceController,
+            }
+            if STARTUP_PARALLEL:
+                subsystems = init_parallel(factories, timer)
+            else:
+                subsystems = {name: timer.run(name, factory) for name, factory in factories.items()}
+            self.detector = subsystems["ObjectDetector"]
+            self.narrator = subsystems["Narrator"]
+            self.voice_ctrl = subsystems["VoiceController"]
+            # Voice commands and object names (including every detector class) in one compiled matcher
+            self.intents = IntentMatcher(extra_objects=self.detector.class_names)
+            # The offline grammar needs them too, or "stop sign" is heard as "stop [unk]"
+            self.voice_ctrl.set_vocabulary(self.detector.class_names)
+            # Static scenes reuse the last detection / OCR result instead of rerunning the models
+            self.detection_gate = MotionGate() if MOTION_GATE_ENABLED else None
+            self.ocr_gate = MotionGate() if MOTION_GATE_ENABLED else None
+            # Repeated requests on a recently seen view are answered from the fingerprint cache
+            self.result_cache = ResultCache() if RESULT_CACHE_ENABLED else None
+            # The displayed frame is JPEG-encoded once in the background for the web dashboard
+            self.frame_publisher = FramePublisher() if WEB_FRAME_ENABLED else None
+            if BACKGROUND_DETECTION_ENABLED:
+                # Tracking keeps the continuous worker cheap by skipping YOLO between keyframes
+                worker_detector = TrackedDetector(self.detector) if TRACKING_ENABLED else self.detector
+                self.background_detector = BackgroundDetector(worker_detector, self.frame_source,
+                                                              gate=self.detection_gate)
+                self.background_detector.start()
+            else:
+                self.background_detector = None
+            # OCR and emotion models load on first use (optionally prefetched in the background)
+            lazy = {"TextReader": text_reader_factory}
+            if EMOTION_DETECTION_ENABLED:
+                lazy["EmotionDetector"] = emotion_factory
+            for name, factory in lazy.items():
+                if LAZY_LOAD_MODELS:
+                    lazy[name] = LazySubsystem(name, factory, timer)
+                    if PREFETCH_LAZY_MODELS:
+                        lazy[name].prefetch()
+                else:
+                    lazy[name] = timer.run(name, factory)
+            self.text_reader = lazy["TextReader"]
+            self.emotion_detector = lazy.get("EmotionDetector")
             self.running = True
             self.last_description = ""
             self.last_emotion = None
+            self.reading_mode = False
+            self.reading_thread = None
+            self.reading_stop = threading.Event()
+            self.reading_lock = threading.Lock()  # Toggled from the main and the voice thread
+            timer.report()
             print("✅ Initialization complete!\n")
         except Exception as e:
             print(f"❌ Init error: {e}")
@@ -92,6 +131,7 @@ class VisionAssistantApp:
         print("  [D] - Describe scene (includes doors!)")
         print("  [T] - Read text (OCR)")
         print("  [E] - Detect emotion (NEW!)")
+        print("  [M] - Toggle reading mode")
         print("  [R] - Repeat last")
         print("  [Q] - Quit")
         print("\n  Voice Commands:")
@@ -99,6 +139,7 @@ class VisionAssistantApp:
         print("    'where is the door' - Find door")
         print("    'where is [object]' - Find object")
         print("    'read text' - OCR")
+        print("    'reading mode' / 'stop reading' - Continuous reading")
         print("    'repeat' - Repeat")
         print("    'emotion' - Detect emotion")
         print("    'stop' - Quit")
@@ -111,68 +152,97 @@ class VisionAssistantApp:
                 if command is None:
                     continue
                 print(f"🎤 '{command}'")
-                if check_command(command, DESCRIBE_COMMANDS):
-                    self.describe_scene()
-                elif "read" in command or "text" in command:
-                    self.read_text()
-                elif check_command(command, REPEAT_COMMANDS):
-                    self.repeat_description()
-                elif check_command(command, EXIT_COMMANDS):
-                    self.narrator.narrate("Goodbye!")
+                intent = self.intents.match(command)
+                if intent.name == INTENT_READING:
+                    self.set_reading_mode(intent.slots["enabled"])
+                elif intent.name == INTENT_FIND_OBJECT:
+                    self.find_object(intent.slots["object"])
+                elif intent.name == INTENT_EXIT:
+                    self.narrator.narrate("Goodbye!", priority=PRIORITY_URGENT, interrupt=True, wait=True)
                     self.running = False
                     break
-                elif self.is_object_query(command):
-                    object_name = self.extract_object_name(command)
-                    if object_name:
-                        self.find_object(object_name)
-                elif "emotion" in command and self.emotion_detector:
+                elif intent.name == INTENT_READ_TEXT:
+                    self.read_text()
+                elif intent.name == INTENT_EMOTION and self.emotion_detector:
                     self.detect_emotion()
+                elif intent.name == INTENT_REPEAT:
+                    self.repeat_description()
+                elif intent.name == INTENT_DESCRIBE:
+                    self.describe_scene()
             except Exception as e:
                 print(f"❌ Voice error: {e}")
 
-    def is_object_query(self, command):
-        return any(kw in command.lower() for kw in OBJECT_QUERY_KEYWORDS)
+    def show(self, frame):
+        """Display a frame locally and publish it to the web dashboard"""
+        cv2.imshow(WINDOW_NAME, frame)
+        if self.frame_publisher:
+            self.frame_publisher.publish(frame)
+
+    def current_detections(self):
+        """
+        Detections for the current view: the background worker's cached result
+        when it is fresh enough, otherwise a synchronous pass on the latest frame
+        Returns:
+            Tuple of (frame, detections, annotated_frame) or None on camera error
+        """
+        if self.background_detector:
+            cached = self.background_detector.latest()
+            if cached is not None:
+                log_event("detections", source="background", labels=cached.detections.labels)
+                return cached.frame, cached.detections, cached.annotated_frame
+        ret, frame = self.detector.get_frame()
+        if not ret:
+            return None
+        detections, annotated_frame = self.run_stage(
+            "detection", frame, self.detector.detect_with_doors, gate=self.detection_gate)
+        log_event("detections", source="live", labels=detections.labels)
+        return frame, detections, annotated_frame
 
-    def extract_object_name(self, command):
-        cmd = command.lower()
-        for obj in QUERYABLE_OBJECTS:
-            if obj in cmd:
-                return obj
-        words = cmd.split()
-        skip = ["is", "the", "a", "an", "where", "find", "locate", "there", "see", "can", "you", "do"]
-        for word in words:
-            if word not in skip and len(word) > 2:
-                return word
-        return None
+    def run_stage(self, stage, frame, fn, gate=None, **params):
+        """
+        Run an expensive stage on a frame, reusing earlier work where possible:
+        the motion gate returns the last result on an unchanged view, and the
+        fingerprint cache returns results for recently seen (near-)identical views
+        """
+        compute = fn
+        if self.result_cache:
+            def compute(f, **kwargs):
+                return self.result_cache.get_or_compute(stage, f, fn, **kwargs)
+        t0 = time.perf_counter()
+        try:
+            if gate:
+                return gate.run(frame, compute, **params)
+            return compute(frame, **params)
+        finally:
+            log_event("timing", stage=stage, ms=round((time.perf_counter() - t0) * 1000, 1))
 
     def find_object(self, object_name):
         try:
             print(f"\n🔍 Searching: {object_name}...")
-            ret, frame = self.detector.get_frame()
-            if not ret:
+            result = self.current_detections()
+            if result is None:
                 self.narrator.narrate("Camera error.")
                 return
-            detections, annotated_frame = self.detector.detect_with_doors(frame)
+            frame, detections, annotated_frame = result
             h, w = frame.shape[:2]
             found = False
-            for (label, bbox) in detections:
-                if label == "door" and object_name == "door":
-                    angle = calc_center_angle(bbox, w)
-                    distance_m = estimate_distance_to_object(bbox)
-                    dist_text = f"{distance_m:.1f} meters" if distance_m else "unknown distance"
-                    direction = "right" if angle > 0 else "left"
-                    angle_deg = abs(int(round(angle)))
-                    angle_phrase = "almost in front of you" if angle_deg < 7 else f"turn {angle_deg} degrees {direction}"
-                    spoken = f"Door detected, {dist_text} ahead. To face the door, {angle_phrase}."
-                    print(f"📢 {spoken}")
-                    self.narrator.narrate(spoken)
-                    found = True
-                    break
+            doors = detections.select(detections.sources == SOURCE_DOOR)
+            if object_name == "door" and len(doors):
+                angle = float(doors.center_angles(w)[0])
+                distance_m = float(doors.distances_m()[0])
+                dist_text = f"{distance_m:.1f} meters" if not math.isnan(distance_m) else "unknown distance"
+                direction = "right" if angle > 0 else "left"
+                angle_deg = abs(int(round(angle)))
+                angle_phrase = "almost in front of you" if angle_deg < 7 else f"turn {angle_deg} degrees {direction}"
+                spoken = f"Door detected, {dist_text} ahead. To face the door, {angle_phrase}."
+                print(f"📢 {spoken}")
+                self.narrator.narrate(spoken)
+                found = True
             if not found:
                 response = generate_object_query_response(object_name, detections, w, h)
                 print(f"📢 {response}")
                 self.narrator.narrate(response)
-            cv2.imshow(WINDOW_NAME, annotated_frame)
+            self.show(annotated_frame)
             cv2.waitKey(700)
             print("✅ Done\n")
         except Exception as e:
@@ -182,24 +252,20 @@ class VisionAssistantApp:
     def describe_scene(self):
         try:
             print("\n🔍 Scanning...")
-            ret, frame = self.detector.get_frame()
-            if not ret:
+            result = self.current_detections()
+            if result is None:
                 self.narrator.narrate("Camera error.")
                 return
-            detections, annotated_frame = self.detector.detect_with_doors(frame)
+            frame, detections, annotated_frame = result
             if not detections:
                 desc = "I don't see any objects nearby."
             else:
                 h, w = frame.shape[:2]
-                spatial = []
-                for label, bbox in detections:
-                    direction, distance = get_position_info(bbox, w, h)
-                    spatial.append((label, direction, distance))
-                desc = generate_spatial_description(spatial)
+                desc = generate_spatial_description(detections.spatial_info(w, h))
             print(f"📢 {desc}")
             self.last_description = desc
             self.narrator.narrate(desc)
-            cv2.imshow(WINDOW_NAME, annotated_frame)
+            self.show(annotated_frame)
             cv2.waitKey(300)
             print("✅ Done\n")
         except Exception as e:
@@ -213,36 +279,100 @@ class VisionAssistantApp:
             if not ret:
                 self.narrator.narrate("Camera error.")
                 return
-            texts, annotated = self.text_reader.read_text(frame, preprocess=False)
+            texts, annotated = self.run_stage(
+                "ocr", frame, self.text_reader.read_text, gate=self.ocr_gate, preprocess=OCR_PREPROCESS)
             output = self.text_reader.format_text_output(texts)
             if texts:
                 print(f"  • {texts}")
             print(f"📢 {output}")
             self.narrator.narrate(output)
-            cv2.imshow(WINDOW_NAME, annotated)
+            self.show(annotated)
             cv2.waitKey(500)
             print("✅ Done\n")
         except Exception as e:
             print(f"❌ Error: {e}")
 
+    def set_reading_mode(self, enabled):
+        """Start or stop continuous reading of newly appearing text"""
+        with self.reading_lock:
+            if enabled == self.reading_mode:
+                return
+            if enabled:
+                # A loop stopped a moment ago may still be finishing its OCR pass. Give it a
+                # moment, but don't hold up input for a whole pass: its own stop event keeps
+                # it from narrating, so it can finish alongside the new loop.
+                if self.reading_thread is not None:
+                    self.reading_thread.join(timeout=READING_STOP_TIMEOUT)
+                self.reading_stop = threading.Event()
+                self.reading_mode = True
+                self.narrator.narrate("Reading mode on.")
+                self.reading_thread = threading.Thread(
+                    target=self.reading_loop, args=(self.reading_stop,), daemon=True)
+                self.reading_thread.start()
+            else:
+                self.reading_mode = False
+                self.reading_stop.set()
+                self.narrator.narrate("Reading mode off.")
+
+    def reading_loop(self, stop):
+        """Read newly appearing text until stop is set (each loop has its own event)"""
+        session = ReadingSession(self.text_reader)
+        last_id = 0
+        while self.running and not stop.is_set():
+            item = self.frame_source.wait_for_new(last_id)
+            if item is None:
+                if not self.frame_source.running:
+                    break  # Camera gone: wait_for_new would return at once forever
+                continue
+            last_id = item.frame_id
+            try:
+                new_texts = session.update(item.frame)
+            except Exception as e:
+                print(f"❌ Reading error: {e}")
+                continue
+            if new_texts and not stop.is_set():
+                print(f"📖 {new_texts}")
+                # One utterance so newer text does not supersede the earlier lines
+                self.narrator.narrate(", ".join(new_texts))
+        print(f"📖 Reading mode stopped ({session.recognitions} recognitions over {session.frames} frames)")
+
     def detect_emotion(self):
         try:
             if not self.emotion_detector:
                 print("⚠️ Emotion detection is not enabled.")
                 return
             print("\n😊 Detecting emotion...")
-            ret, frame = self.emotion_detector.get_frame()
-            if not ret:
-                self.narrator.narrate("Camera error.")
-                return
-            emotion = self.emotion_detector.detect_emotion(frame)
-            annotated = self.emotion_detector.annotate_frame(frame, emotion)
-            out_str = f"You look {emotion}."
+            # Reuse person boxes from the background detector when they are fresh; they only
+            # fit the frame they were detected on, so that frame is the one analyzed
+            person_boxes = None
+            cached = self.background_detector.latest() if self.background_detector else None
+            if cached is not None:
+                frame = cached.frame.copy()  # Shared with the frame buffer; annotated below
+                persons = cached.detections.select(cached.detections.match("person"))
+                person_boxes = persons.boxes.tolist()
+            else:
+                ret, frame = self.emotion_detector.get_frame()
+                if not ret:
+                    self.narrator.narrate("Camera error.")
+                    return
+            # The boxes are a parameter so they are part of the result-cache key
+            faces = self.run_stage(
+                "emotion", frame, self.emotion_detector.detect_emotions, person_boxes=person_boxes)
+            if faces:
+                emotion = ", ".join(face["emotion"] for face in faces)
+                annotated = self.emotion_detector.annotate_faces(frame, faces)
+            else:
+                emotion = self.emotion_detector.analyze_full_frame(frame)
+                annotated = self.emotion_detector.annotate_frame(frame, emotion)
+            if len(faces) > 1:
+                out_str = f"I see {len(faces)} faces: {emotion}."
+            else:
+                out_str = f"You look {emotion}."
             print(f"📢 {out_str}")
             if emotion != self.last_emotion:
                 self.narrator.narrate(out_str)
                 self.last_emotion = emotion
-            cv2.imshow(WINDOW_NAME, annotated)
+            self.show(annotated)
             cv2.waitKey(500)
             print("✅ Done\n")
         except Exception as e:
@@ -268,25 +398,45 @@ class VisionAssistantApp:
                 ret, frame = self.detector.get_frame()
                 if not ret:
                     break
-                cv2.putText(frame, "D: Scan | T: Text | E: Emotion | R: Repeat | Q: Quit",
+                cv2.putText(frame, "D: Scan | T: Text | E: Emotion | M: Reading | R: Repeat | Q: Quit",
                             (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
-                cv2.imshow(WINDOW_NAME, frame)
+                self.show(frame)
                 key = cv2.waitKey(1) & 0xFF
                 if key == ord('q'):
                     print("\n👋 Quitting...")
-                    self.narrator.narrate("Goodbye!")
+                    self.narrator.narrate("Goodbye!", priority=PRIORITY_URGENT, interrupt=True, wait=True)
                     self.running = False
                 elif key == ord('d'):
                     self.describe_scene()
                 elif key == ord('t'):
                     self.read_text()
+                elif key == ord('m'):
+                    self.set_reading_mode(not self.reading_mode)
                 elif key == ord('r'):
                     self.repeat_description()
                 elif key == ord('e') and self.emotion_detector:
                     self.detect_emotion()
+            if self.background_detector:
+                self.background_detector.stop()
+            if self.frame_publisher:
+                self.frame_publisher.stop()
             self.detector.release()
-            if self.emotion_detector:
+            # Don't load a lazily-initialized model just to release it
+            if self.emotion_detector and getattr(self.emotion_detector, "loaded", True):
                 self.emotion_detector.release()
+            # Worker-backed OCR has processes and shared memory to free
+            if getattr(self.text_reader, "loaded", True) and hasattr(self.text_reader, "release"):
+                self.text_reader.release()
+            self.frame_source.release()
+            self.narrator.stop()
+            for name, gate in (("detection", self.detection_gate), ("OCR", self.ocr_gate)):
+                if gate:
+                    print(f"Motion gate ({name}): skipped {gate.skips}/{gate.checks} "
+                          f"({gate.skip_ratio:.0%})")
+            if self.result_cache:
+                stats = self.result_cache.stats()
+                print(f"Result cache: {stats['hits']} hits, {stats['misses']} misses "
+                      f"({stats['hit_ratio']:.0%})")
             print("\n✅ Stopped\n")
         except Exception as e:
             print(f"❌ Error: {e}")
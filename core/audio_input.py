@@ -0,0 +1,281 @@
+"""
+Audio Input Module for Vision Assistant
+Persistent audio sources (microphone or WAV file), a capture thread with a ring buffer,
+voice-activity detection and segmentation
+"""
+
+import threading
+import time
+import wave
+from collections import deque
+
+import numpy as np
+from core.config import (
+    VOICE_SAMPLE_RATE, VOICE_CHUNK_MS, VOICE_ENERGY_THRESHOLD, VOICE_VAD,
+    VOICE_PAUSE_SECONDS, VOICE_PHRASE_LIMIT, VOICE_PREROLL_SECONDS, VOICE_BUFFER_SECONDS
+)
+
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+
+def chunk_bytes(sample_rate=VOICE_SAMPLE_RATE, chunk_ms=VOICE_CHUNK_MS):
+    """Bytes in one chunk of 16-bit mono audio"""
+    return int(sample_rate * chunk_ms / 1000) * 2
+
+
+class WavFileSource:
+    """Reads a recorded WAV file as 16-bit mono chunks at the recognizer sample rate"""
+
+    def __init__(self, path, sample_rate=VOICE_SAMPLE_RATE, chunk_ms=VOICE_CHUNK_MS, realtime=False):
+        """
+        Args:
+            path: 16-bit PCM WAV file (any rate / channel count)
+            realtime: Pace reads at the chunk duration, like a live microphone
+        """
+        self.sample_rate = sample_rate
+        self.realtime = realtime
+        # Unpaced reads outrun any consumer; the capture buffer then waits instead of dropping
+        self.live = realtime
+        self._chunk_seconds = chunk_ms / 1000
+        self.chunk_size = chunk_bytes(sample_rate, chunk_ms)
+        with wave.open(path, "rb") as wav:
+            channels, width, rate = wav.getnchannels(), wav.getsampwidth(), wav.getframerate()
+            raw = wav.readframes(wav.getnframes())
+        if width != 2:
+            raise ValueError(f"{path}: only 16-bit WAV files are supported")
+        samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32)
+        if channels > 1:
+            samples = samples.reshape(-1, channels).mean(axis=1)
+        if rate != sample_rate:
+            positions = np.arange(0, len(samples), rate / sample_rate)
+            samples = np.interp(positions, np.arange(len(samples)), samples)
+        self._data = samples.astype(np.int16).tobytes()
+        self._pos = 0
+
+    def read(self):
+        """Next chunk of audio, or None at the end of the file"""
+        if self._pos >= len(self._data):
+            return None
+        chunk = self._data[self._pos:self._pos + self.chunk_size]
+        self._pos += self.chunk_size
+        if self.realtime:
+            time.sleep(self._chunk_seconds)
+        if len(chunk) < self.chunk_size:
+            chunk += b"\0" * (self.chunk_size - len(chunk))
+        return chunk
+
+    def close(self):
+        pass
+
+
+class MicrophoneSource:
+    """One PyAudio input stream kept open for the life of the app"""
+
+    live = True
+
+    def __init__(self, sample_rate=VOICE_SAMPLE_RATE, chunk_ms=VOICE_CHUNK_MS, device_index=None):
+        import pyaudio
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_bytes(sample_rate, chunk_ms)
+        self._audio = pyaudio.PyAudio()
+        self._stream = self._audio.open(
+            format=pyaudio.paInt16, channels=1, rate=sample_rate, input=True,
+            frames_per_buffer=self.chunk_size // 2, input_device_index=device_index
+        )
+
+    def read(self):
+        """Next chunk of audio (blocks for one chunk duration)"""
+        return self._stream.read(self.chunk_size // 2, exception_on_overflow=False)
+
+    def close(self):
+        self._stream.stop_stream()
+        self._stream.close()
+        self._audio.terminate()
+
+
+class AudioRingBuffer:
+    """
+    Bounded chunk queue between the capture thread and the recognizer
+    When the consumer falls behind, the oldest audio is dropped (and counted),
+    unless the writer asks to block until there is room.
+    """
+
+    def __init__(self, capacity):
+        self._chunks = deque(maxlen=capacity)
+        self._cond = threading.Condition()
+        self.closed = False
+        self.written = 0
+        self.dropped = 0
+
+    def write(self, chunk, block=False):
+        """
+        Args:
+            block: Wait for the reader to make room instead of dropping the oldest chunk
+        """
+        with self._cond:
+            if block:
+                self._cond.wait_for(lambda: len(self._chunks) < self._chunks.maxlen or self.closed)
+                if self.closed:
+                    return
+            if len(self._chunks) == self._chunks.maxlen:
+                self.dropped += 1
+            self._chunks.append(chunk)
+            self.written += 1
+            self._cond.notify_all()
+
+    def read(self, timeout=None):
+        """Oldest unread chunk; None once closed and drained (or on timeout)"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._chunks or self.closed, timeout):
+                return None
+            if not self._chunks:
+                return None
+            chunk = self._chunks.popleft()
+            self._cond.notify_all()  # Room for a blocked writer
+            return chunk
+
+    def clear(self):
+        with self._cond:
+            self._chunks.clear()
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def __len__(self):
+        return len(self._chunks)
+
+
+class AudioCapture:
+    """Background thread that keeps reading a source into a ring buffer"""
+
+    def __init__(self, source, buffer_seconds=VOICE_BUFFER_SECONDS, chunk_ms=VOICE_CHUNK_MS):
+        """
+        Args:
+            source: MicrophoneSource, WavFileSource or any object with read() and close();
+                sources with live=False (e.g. an unpaced file) are never dropped from
+            buffer_seconds: Audio retained while the consumer is busy
+        """
+        self.source = source
+        self.buffer = AudioRingBuffer(max(1, int(buffer_seconds * 1000 / chunk_ms)))
+        self._block = not getattr(source, "live", True)
+        self.running = True
+        self._thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._thread.start()
+
+    def _capture_loop(self):
+        try:
+            while self.running:
+                chunk = self.source.read()
+                if chunk is None:
+                    break  # End of a recorded file
+                self.buffer.write(chunk, block=self._block)
+        except Exception as e:
+            print(f"⚠️ Audio capture error: {e}")
+        finally:
+            self.buffer.close()
+
+    def read(self, timeout=None):
+        """Next buffered chunk, or None when the source has ended"""
+        return self.buffer.read(timeout)
+
+    def close(self):
+        self.running = False
+        self.buffer.close()  # Also releases a writer blocked on a full buffer
+        self._thread.join(timeout=1.0)
+        self.source.close()
+
+
+def chunk_rms(chunk):
+    samples = np.frombuffer(chunk, dtype=np.int16).astype(np.float32)
+    return float(np.sqrt(np.mean(samples * samples))) if len(samples) else 0.0
+
+
+class EnergyVAD:
+    """RMS-energy voice detector with an ambient-noise-adaptive threshold"""
+
+    def __init__(self, threshold=VOICE_ENERGY_THRESHOLD):
+        self.threshold = threshold
+
+    def calibrate(self, chunks):
+        """Raise the threshold above measured ambient noise (like adjust_for_ambient_noise)"""
+        levels = [chunk_rms(c) for c in chunks]
+        if levels:
+            self.threshold = max(self.threshold, float(np.percentile(levels, 90)) * 1.5)
+
+    def is_speech(self, chunk):
+        return chunk_rms(chunk) > self.threshold
+
+
+class WebRtcVAD:
+    """Wrapper around webrtcvad (chunks must be 10, 20 or 30 ms)"""
+
+    def __init__(self, sample_rate=VOICE_SAMPLE_RATE, aggressiveness=2):
+        self.sample_rate = sample_rate
+        self._vad = webrtcvad.Vad(aggressiveness)
+
+    def calibrate(self, chunks):
+        pass
+
+    def is_speech(self, chunk):
+        return self._vad.is_speech(chunk, self.sample_rate)
+
+
+def make_vad(kind=VOICE_VAD):
+    """'webrtc' when the package is installed, otherwise energy-based"""
+    if kind == "webrtc" and webrtcvad is not None:
+        return WebRtcVAD()
+    return EnergyVAD()
+
+
+class Segmenter:
+    """
+    Turns a chunk stream into utterances
+    push() reports 'start' (with pre-roll audio), 'speech', 'end' or None for silence.
+    """
+
+    def __init__(self, vad, chunk_ms=VOICE_CHUNK_MS, pause_seconds=VOICE_PAUSE_SECONDS,
+                 max_seconds=VOICE_PHRASE_LIMIT, preroll_seconds=VOICE_PREROLL_SECONDS):
+        self.vad = vad
+        self.chunk_ms = chunk_ms
+        self.end_chunks = max(1, int(pause_seconds * 1000 / chunk_ms))
+        self.max_chunks = int(max_seconds * 1000 / chunk_ms)
+        self._preroll = deque(maxlen=max(1, int(preroll_seconds * 1000 / chunk_ms)))
+        self.reset()
+
+    def reset(self):
+        self.in_speech = False
+        self._voiced_run = 0
+        self._silent_run = 0
+        self._length = 0
+        self._preroll.clear()
+
+    def push(self, chunk):
+        """
+        Returns:
+            Tuple of (event, chunks_to_feed) where event is 'start', 'speech', 'end' or None
+        """
+        voiced = self.vad.is_speech(chunk)
+        if not self.in_speech:
+            self._preroll.append(chunk)
+            self._voiced_run = self._voiced_run + 1 if voiced else 0
+            if self._voiced_run >= 2:  # Two voiced chunks in a row ignores clicks
+                self.in_speech = True
+                self._silent_run = 0
+                self._length = len(self._preroll)
+                audio = list(self._preroll)
+                self._preroll.clear()
+                return "start", audio
+            return None, []
+
+        self._length += 1
+        self._silent_run = 0 if voiced else self._silent_run + 1
+        if self._silent_run >= self.end_chunks or self._length >= self.max_chunks:
+            self.reset()
+            return "end", [chunk]
+        return "speech", [chunk]
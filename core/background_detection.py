@@ -0,0 +1,86 @@
+"""
+Background Detection Module for Vision Assistant
+Keeps running detect_with_doors on the newest camera frame and caches the result
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+from core.config import BACKGROUND_MAX_AGE_MS
+
+DetectionResult = namedtuple("DetectionResult", ["timestamp", "frame", "detections", "annotated_frame"])
+
+
+class BackgroundDetector:
+    def __init__(self, detector, frame_source, max_age_ms=BACKGROUND_MAX_AGE_MS, gate=None):
+        """
+        Args:
+            detector: ObjectDetector used for inference
+            frame_source: FrameSource providing the newest frames
+            max_age_ms: Results older than this are treated as stale
+            gate: Optional MotionGate; unchanged frames reuse the previous result
+        """
+        self.detector = detector
+        self.frame_source = frame_source
+        self.gate = gate
+        self.max_age_ms = max_age_ms
+        self._result = None
+        self._lock = threading.Lock()
+        self.running = False
+        self._thread = None
+
+    def start(self):
+        """Start the inference worker"""
+        if self.running:
+            return
+        self.running = True
+        self._thread = threading.Thread(target=self._worker, name="BackgroundDetector", daemon=True)
+        self._thread.start()
+        print(f"✅ Background detection running (max age {self.max_age_ms} ms)")
+
+    def _worker(self):
+        last_id = 0
+        while self.running:
+            item = self.frame_source.wait_for_new(last_id)
+            if item is None:
+                if not self.frame_source.running:
+                    break
+                continue
+            last_id = item.frame_id
+            try:
+                # The buffered frame is shared; the detector only reads it
+                if self.gate is not None:
+                    detections, annotated = self.gate.run(item.frame, self.detector.detect_with_doors)
+                else:
+                    detections, annotated = self.detector.detect_with_doors(item.frame)
+            except Exception as e:
+                print(f"⚠️ Background detection error: {e}")
+                time.sleep(0.5)
+                continue
+            # Stamp with the capture time so age reflects what the user actually sees
+            with self._lock:
+                self._result = DetectionResult(item.timestamp, item.frame, detections, annotated)
+
+    def latest(self, max_age_ms=None):
+        """
+        Most recent result if it is fresh enough
+        Args:
+            max_age_ms: Override for the allowed result age
+        Returns:
+            DetectionResult or None when there is no fresh result
+        """
+        max_age_ms = self.max_age_ms if max_age_ms is None else max_age_ms
+        with self._lock:
+            result = self._result
+        if result is None:
+            return None
+        if (time.time() - result.timestamp) * 1000 > max_age_ms:
+            return None
+        return result
+
+    def stop(self):
+        """Stop the inference worker"""
+        self.running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
@@ -0,0 +1,114 @@
+"""
+Micro-Batching Module for Vision Assistant
+Collects concurrent single-item requests into small batches for one model call.
+An idle model takes a request at once; requests arriving while a batch runs
+are merged into the next one (up to a maximum batch size).
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+
+from core.config import SERVICE_MAX_BATCH
+
+
+class MicroBatcher:
+    def __init__(self, process_batch, max_batch=SERVICE_MAX_BATCH):
+        """
+        Args:
+            process_batch: Function taking a list of items and returning a list of results in order
+            max_batch: Largest batch handed to process_batch
+        """
+        self.process_batch = process_batch
+        self.max_batch = max_batch
+        self._queue = []
+        self._cond = threading.Condition()
+        self.batches = 0
+        self.items = 0
+        self.running = True
+        self._thread = threading.Thread(target=self._batch_loop, daemon=True)
+        self._thread.start()
+
+    def submit(self, item):
+        """Queue one item; returns a Future resolved with its result"""
+        future = Future()
+        with self._cond:
+            if not self.running:
+                raise RuntimeError("MicroBatcher is stopped")
+            self._queue.append((item, future))
+            self._cond.notify()
+        return future
+
+    def __call__(self, item, timeout=None):
+        """Process one item through the batcher and wait for its result"""
+        return self.submit(item).result(timeout)
+
+    def _next_batch(self):
+        with self._cond:
+            self._cond.wait_for(lambda: self._queue or not self.running)
+            # No waiting for company: the model is free now, and whatever queued up
+            # while the previous batch ran goes together
+            batch = self._queue[:self.max_batch]
+            del self._queue[:self.max_batch]
+            return batch
+
+    def _batch_loop(self):
+        while self.running or self._queue:
+            batch = self._next_batch()
+            if not batch:
+                continue
+            items = [item for item, _ in batch]
+            try:
+                results = self.process_batch(items)
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            self.batches += 1
+            self.items += len(batch)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "queued": len(self._queue),
+        }
+
+    def stop(self):
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+        self._thread.join(timeout=2.0)
+
+
+# Benchmark: throughput of concurrent clients with and without micro-batching
+if __name__ == "__main__":
+    from concurrent.futures import ThreadPoolExecutor
+
+    def fake_model(items):
+        """Fixed per-call overhead plus a smaller per-item cost, like a batched CNN forward pass"""
+        time.sleep(0.030 + 0.008 * len(items))
+        return [item * 2 for item in items]
+
+    lock = threading.Lock()
+
+    def unbatched(item):
+        with lock:  # One model, one call at a time
+            return fake_model([item])[0]
+
+    for clients in (1, 4, 16):
+        for name, batch_size in (("unbatched", 1), ("batched", SERVICE_MAX_BATCH)):
+            batcher = MicroBatcher(fake_model, max_batch=batch_size) if batch_size > 1 else None
+            call = batcher if batcher else unbatched
+            requests = clients * 8
+            start = time.perf_counter()
+            with ThreadPoolExecutor(clients) as pool:
+                results = list(pool.map(call, range(requests)))
+            elapsed = time.perf_counter() - start
+            assert results == [i * 2 for i in range(requests)]
+            extra = f", mean batch {batcher.stats()['mean_batch_size']:.1f}" if batcher else ""
+            print(f"{clients:>2} clients, {name:9}: {requests / elapsed:6.1f} req/s{extra}")
+            if batcher:
+                batcher.stop()
@@ -0,0 +1,134 @@
+"""
+Camera Capture Module for Vision Assistant
+One capture thread owns the device and keeps a ring buffer of timestamped frames
+"""
+
+import threading
+import time
+from collections import deque, namedtuple
+
+import cv2
+from core.config import (
+    CAMERA_INDEX, CAMERA_WIDTH, CAMERA_HEIGHT,
+    FRAME_BUFFER_SIZE, FRAME_READ_TIMEOUT, FRAME_STALE_TIMEOUT
+)
+
+TimedFrame = namedtuple("TimedFrame", ["frame_id", "timestamp", "frame"])
+
+
+class FrameSource:
+    def __init__(self, camera_index=CAMERA_INDEX, width=CAMERA_WIDTH,
+                 height=CAMERA_HEIGHT, buffer_size=FRAME_BUFFER_SIZE):
+        """
+        Open the camera and start the background capture thread
+        Args:
+            camera_index: OpenCV device index (or a video file path)
+            width, height: Requested capture resolution
+            buffer_size: Number of recent frames kept in the ring buffer
+        """
+        self.cap = cv2.VideoCapture(camera_index)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        # Keep the driver queue short so we never read stale frames
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        if not self.cap.isOpened():
+            raise Exception("Camera error")
+
+        self._buffer = deque(maxlen=buffer_size)
+        self._cond = threading.Condition()
+        self._frame_id = 0
+        self.running = True
+
+        self._thread = threading.Thread(target=self._capture_loop, name="FrameSource", daemon=True)
+        self._thread.start()
+        print("✅ Camera initialized (threaded capture)")
+
+    def _capture_loop(self):
+        """Read frames as fast as the device delivers them"""
+        failures = 0
+        while self.running:
+            ret, frame = self.cap.read()
+            if not ret:
+                failures += 1
+                if failures > 30:
+                    print("⚠️ Camera stopped delivering frames")
+                    break
+                time.sleep(0.01)
+                continue
+            failures = 0
+            with self._cond:
+                self._frame_id += 1
+                self._buffer.append(TimedFrame(self._frame_id, time.time(), frame))
+                self._cond.notify_all()
+
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+
+    def latest(self, timeout=FRAME_READ_TIMEOUT):
+        """
+        Newest buffered frame without blocking on the device
+        Args:
+            timeout: Seconds to wait if no frame has been captured yet
+        Returns:
+            TimedFrame, or None once the camera has stopped or stalled
+        """
+        with self._cond:
+            if not self._buffer and self.running:
+                self._cond.wait_for(lambda: self._buffer or not self.running, timeout)
+            if not self.running or not self._buffer:
+                return None
+            item = self._buffer[-1]
+            # A device that blocks instead of failing reads leaves an ever older frame behind
+            if time.time() - item.timestamp > FRAME_STALE_TIMEOUT:
+                return None
+            return item
+
+    def wait_for_new(self, last_frame_id, timeout=FRAME_READ_TIMEOUT):
+        """Block until a frame newer than last_frame_id arrives, then return it"""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: (self._buffer and self._buffer[-1].frame_id > last_frame_id) or not self.running,
+                timeout
+            )
+            if self._buffer and self._buffer[-1].frame_id > last_frame_id:
+                return self._buffer[-1]
+            return None
+
+    def history(self, count=None):
+        """Return up to `count` most recent frames, oldest first"""
+        with self._cond:
+            frames = list(self._buffer)
+        return frames if count is None else frames[-count:]
+
+    def read(self):
+        """Drop-in replacement for cv2.VideoCapture.read() returning a private copy"""
+        item = self.latest()
+        if item is None:
+            return False, None
+        return True, item.frame.copy()
+
+    def release(self):
+        """Stop the capture thread and release the device"""
+        self.running = False
+        self._thread.join(timeout=1.0)
+        self.cap.release()
+        print("Camera released")
+
+
+# Test the module
+if __name__ == "__main__":
+    print("Testing FrameSource...")
+    source = FrameSource()
+    start = time.time()
+    reads = 0
+    while time.time() - start < 3:
+        ret, frame = source.read()
+        if not ret:
+            break
+        reads += 1
+    print(f"Non-blocking reads in 3s: {reads}, latest frame id: {source.latest().frame_id}")
+    print(f"Buffered history: {[f.frame_id for f in source.history()]}")
+    source.release()
+    print("✅ FrameSource test complete!")
@@ -5,26 +5,112 @@ Configuration settings for Vision Assistant
 # Model Configuration
 MODEL_PATH = 'models/yolov8n.pt'
 CONFIDENCE_THRESHOLD = 0.5
+DETECTION_BATCH_SIZE = 8      # Frames per model call in ObjectDetector.detect_batch
+DETECTOR_BACKEND = "pytorch"  # "pytorch", "onnx" (ONNX Runtime) or "openvino"; exported on first use
+DETECTOR_INT8 = False         # Quantize the exported model to INT8 (onnx / openvino backends)
+DETECTOR_IMGSZ = 640          # Input size of exported models
+DETECTOR_CALIBRATION_IMAGES = ["image.jpg", "demo/*.jpg"]  # Local images for INT8 calibration
+
+# Background Detection
+BACKGROUND_DETECTION_ENABLED = False  # Keep detecting on the newest frame between commands
+BACKGROUND_MAX_AGE_MS = 500           # Older cached results fall back to a fresh pass
+
+# Motion Gate (skip detection/OCR when the view has not changed)
+MOTION_GATE_ENABLED = True
+MOTION_GATE_SIZE = (32, 24)       # Thumbnail used for frame differencing
+MOTION_GATE_PIXEL_DELTA = 12      # Intensity change for a thumbnail pixel to count as changed
+MOTION_GATE_THRESHOLD = 0.02      # Fraction of changed pixels that counts as a new scene
+
+# Result Cache (perceptual fingerprint -> detection / OCR / emotion result)
+RESULT_CACHE_ENABLED = True
+RESULT_CACHE_SIZE = 64            # Entries across all stages (LRU)
+RESULT_CACHE_TTL = 10.0           # Seconds an entry stays valid
+RESULT_CACHE_HASH_SIZE = 16       # dHash grid -> 256-bit fingerprint
+RESULT_CACHE_MAX_DISTANCE = 6     # Differing bits still treated as the same view
+
+# Object Tracking (used by background detection)
+TRACKING_ENABLED = False          # Run YOLO on keyframes only and track objects in between
+TRACKER_KEYFRAME_INTERVAL = 5     # Full detection every N frames (or sooner if tracks are lost)
+TRACKER_IOU_THRESHOLD = 0.3
+TRACKER_MAX_MISSES = 2            # Keyframes a track may go unmatched before it is dropped
+TRACKER_FLOW_SCALE = 0.5          # Downscale factor for optical flow
+
+# Door Detection
+DOOR_DETECTION_SCALE = 0.5    # Downscale before edge detection (1.0 = full resolution)
+DOOR_MAX_RESULTS = 3
 
 # Camera Configuration
 CAMERA_INDEX = 0
 CAMERA_WIDTH = 640
 CAMERA_HEIGHT = 480
 CAMERA_FPS = 30
+FRAME_BUFFER_SIZE = 5         # Frames kept in the capture ring buffer
+FRAME_READ_TIMEOUT = 1.0      # Seconds to wait for the first frame
+FRAME_STALE_TIMEOUT = 2.0     # A newest frame older than this means the camera has stalled
 
 # Text-to-Speech Configuration
 TTS_RATE = 180
 TTS_VOLUME = 1.0
+NARRATION_MAX_AGE = 5.0       # Seconds before a queued (non-urgent) message is dropped as stale
+NARRATION_WAIT_TIMEOUT = 10.0 # Longest narrate(..., wait=True) blocks for its text to be spoken
+
+# Speech Audio Cache (needs PyAudio for playback; falls back to live TTS otherwise)
+SPEECH_CACHE_ENABLED = True
+SPEECH_CACHE_DIR = 'cache/tts'
+SPEECH_CACHE_MAX_BYTES = 16 * 1024 * 1024  # Decoded audio kept in memory
+SPEECH_CACHE_MAX_FILES = 500               # Rendered WAV files kept on disk
+SPEECH_CACHE_MAX_TEXT = 120                # Longer fragments are never cached
+SPEECH_CACHE_MIN_USES = 3                  # Times a fragment is spoken live before it is rendered
+SPEECH_CACHE_MAX_PENDING = 32              # Fragments waiting to be rendered while idle
+SPEECH_CACHE_TRACKED = 1000                # Uncached fragments whose use counts are kept
+
+# OCR Configuration
+OCR_PARALLEL_RECOGNITION = True   # Recognize raw and preprocessed regions concurrently
+OCR_PREFILTER_ENABLED = True      # Only send candidate text regions to EasyOCR
+OCR_REGION_PADDING = 12           # Margin around candidate regions (pixels)
+OCR_MAX_REGIONS = 8               # More candidates than this -> OCR the full frame
+OCR_FULL_FRAME_COVERAGE = 0.6     # Candidates covering more of the frame -> OCR the full frame
+OCR_PREPROCESS = True             # Also try the preprocessed image (see OCR_ADAPTIVE_PREPROCESS)
+OCR_ADAPTIVE_PREPROCESS = True    # Learn per lighting condition whether raw or preprocessed wins
+OCR_POLICY_WARMUP = 5             # Both-path comparisons before a lighting bucket is trusted
+OCR_POLICY_EXPLORE_EVERY = 10     # Still run both paths on every Nth frame
+OCR_POLICY_SMOOTHING = 0.3        # Weight of the newest comparison in the win rate
+
+# Reading Mode (continuous incremental OCR)
+READING_IOU_THRESHOLD = 0.3       # Overlap for a text region to count as already known
+READING_CHANGE_THRESHOLD = 18     # Mean thumbnail difference that means the region's text changed
+READING_REGION_TIMEOUT = 3.0      # Seconds before an unseen region is forgotten
+READING_MEMORY_SIZE = 200         # Recently read texts that are not repeated
+READING_STOP_TIMEOUT = 0.5        # Seconds a toggle waits for the previous reading loop to end
 
 # Speech Recognition Configuration
 VOICE_ENERGY_THRESHOLD = 300
 VOICE_TIMEOUT = 3
 VOICE_PHRASE_LIMIT = 3
+VOICE_BACKEND = "google"          # "google" (online) or "vosk" (offline, command vocabulary only)
+VOSK_MODEL_PATH = "models/vosk-model-small-en-us"
+VOICE_SAMPLE_RATE = 16000
+VOICE_CHUNK_MS = 30               # Audio chunk length (10, 20 or 30 for webrtcvad)
+VOICE_VAD = "webrtc"              # "webrtc" when installed, otherwise energy-based
+VOICE_PAUSE_SECONDS = 0.5         # Silence that ends a phrase
+VOICE_PREROLL_SECONDS = 0.3       # Audio kept from before speech onset
+VOICE_CALIBRATION_SECONDS = 0.5   # Ambient noise measured at startup
+VOICE_BUFFER_SECONDS = 10         # Captured audio held while a command is being handled
+VOICE_EARLY_FIRE_CHUNKS = 3       # Chunks a recognized partial command must stay stable before firing
 
 # Voice Commands
 DESCRIBE_COMMANDS = ["describe", "what", "see", "scan", "look", "surrounding"]
 REPEAT_COMMANDS = ["repeat", "again", "last"]
 EXIT_COMMANDS = ["stop", "exit", "quit", "bye", "goodbye"]
+READ_TEXT_COMMANDS = ["read", "text"]
+READING_MODE_COMMANDS = ["reading", "reading mode"]
+EMOTION_COMMANDS = ["emotion", "emotions", "feeling", "mood"]
+NEGATION_WORDS = ["off"]          # "reading off" (like "stop reading") leaves reading mode
+# Words between command words: part of the offline grammar, never taken as an object name
+FILLER_WORDS = [
+    "is", "the", "a", "an", "where", "find", "locate", "there", "see", "can", "you",
+    "do", "my", "any", "some", "me", "show", "please", "for"
+]
 
 # Object Query Commands
 OBJECT_QUERY_KEYWORDS = [
@@ -43,12 +129,40 @@ QUERYABLE_OBJECTS = [
     "refrigerator", "microwave", "oven", "sink", "toilet"
 ]
 
+# Spoken names -> YOLO class names
+OBJECT_SYNONYMS = {
+    "phone": "cell phone", "mobile": "cell phone", "cellphone": "cell phone",
+    "people": "person", "man": "person", "woman": "person",
+    "sofa": "couch", "television": "tv", "monitor": "tv", "computer": "laptop",
+    "table": "dining table", "fridge": "refrigerator", "bike": "bicycle",
+    "motorbike": "motorcycle", "plant": "potted plant", "mug": "cup", "doors": "door"
+}
+
 # Non-detectable objects
 NON_DETECTABLE_OBJECTS = [
     "window", "wall", "ceiling", "floor", 
     "room", "stairs", "elevator", "hallway"
 ]
 
+# Logging (stdout mirror for the web dashboard + structured events)
+LOG_FILE = "web_output.log"
+LOG_EVENTS_FILE = "web_events.jsonl"
+LOG_MAX_BYTES = 1024 * 1024       # Rotate a log once it reaches this size
+LOG_BACKUP_COUNT = 3              # Rotated files kept (web_output.log.1 ...)
+LOG_FLUSH_INTERVAL = 0.5          # Seconds between background flushes
+LOG_BUFFER_BYTES = 64 * 1024      # Flush sooner once this much is buffered
+
+# Web Dashboard
+WEB_TAIL_INTERVAL = 0.25          # Seconds between checks of the log for new output
+WEB_HISTORY_CHARS = 64 * 1024     # Recent log text kept in memory for new viewers
+WEB_KEEPALIVE_SECONDS = 15        # Comment sent on idle event streams to keep them open
+WEB_FRAME_ENABLED = True          # App publishes the displayed frame for the dashboard
+WEB_FRAME_PATH = "cache/frame.jpg"
+WEB_FRAME_QUALITY = 70            # JPEG quality of the published frame
+WEB_FRAME_MAX_WIDTH = 640         # Wider frames are downscaled before encoding
+WEB_FRAME_INTERVAL = 0.2          # Seconds between published frames (5 fps)
+WEB_FRAME_POLL = 0.05             # Seconds between checks for a new frame on the web side
+
 # UI Configuration
 WINDOW_NAME = "Vision Assistant"
 BOX_COLOR = (0, 255, 0)
@@ -58,6 +172,33 @@ FONT_SCALE = 0.6
 FONT_COLOR = (0, 255, 0)
 FONT_THICKNESS = 2
 
+# Headless Service (service.py)
+SERVICE_PORT = 5002
+SERVICE_MAX_BATCH = 8             # Detection requests queued during a model call merged into the next
+SERVICE_REQUEST_TIMEOUT = 30      # Seconds a request may wait for its result
+SERVICE_MAX_IMAGE_BYTES = 8 * 1024 * 1024
+
+# Worker Processes (detection / OCR / emotion outside the main process)
+WORKER_PROCESSES_ENABLED = False
+DETECTION_WORKERS = 1
+OCR_WORKERS = 1
+EMOTION_WORKERS = 1
+WORKER_TORCH_THREADS = 2          # Math-library threads per worker process
+WORKER_CPU_AFFINITY = {           # CPU ids per kind, split among its workers (None = no pinning)
+    "detection": None,
+    "ocr": None,
+    "emotion": None,
+}
+WORKER_SLOTS_PER_WORKER = 2       # Shared-memory frames in flight per worker
+WORKER_MAX_FRAME_SHAPE = (1080, 1920, 3)  # Largest frame a shared-memory slot holds
+WORKER_START_TIMEOUT = 180        # Seconds to wait for a worker to load its model
+WORKER_CALL_TIMEOUT = 60          # Seconds a caller waits for one worker result
+
+# Startup
+STARTUP_PARALLEL = True       # Initialize detector, narrator and voice concurrently
+LAZY_LOAD_MODELS = True       # Load OCR / emotion models on first use
+PREFETCH_LAZY_MODELS = True   # ...but start loading them in the background right after startup
+
 # Application Info
 APP_NAME = "Vision Assistant"
 APP_VERSION = "1.0.0"
@@ -65,6 +206,9 @@ APP_DESCRIPTION = "AI-Powered Accessibility Tool"
 
 # Emotion Detection
 EMOTION_DETECTION_ENABLED = True
+EMOTION_FACE_SIZE = 224           # Face crops are resized to this square before analysis
+EMOTION_HEAD_FRACTION = 0.4       # Top part of a person box searched for a face
+EMOTION_MAX_FACES = 6             # Faces analyzed per frame (largest first)
 
 
 print(f"✅ {APP_NAME} v{APP_VERSION} - Configuration loaded")
@@ -1,77 +1,363 @@
 """
 Object Detection Module
 Includes YOLOv8 + Door Detection
+YOLO runs on PyTorch or on an exported ONNX Runtime / OpenVINO model (optionally INT8)
 """
 
-from ultralytics import YOLO
+import glob
+import os
+import shutil
+import threading
 import cv2
-from core.config import MODEL_PATH, CONFIDENCE_THRESHOLD, CAMERA_INDEX, CAMERA_WIDTH, CAMERA_HEIGHT
-from core.utils import draw_bounding_box, detect_door_shapes
+import numpy as np
+from core.config import (
+    MODEL_PATH, CONFIDENCE_THRESHOLD, DETECTION_BATCH_SIZE,
+    DETECTOR_BACKEND, DETECTOR_INT8, DETECTOR_IMGSZ, DETECTOR_CALIBRATION_IMAGES
+)
+from core.camera import FrameSource
+from core.detections import Detections, SOURCE_DOOR
+from core.door_detection import DoorDetector
+from core.utils import draw_bounding_box
+
+
+BACKENDS = ("pytorch", "onnx", "openvino")
+
+
+def calibration_images(patterns=DETECTOR_CALIBRATION_IMAGES):
+    """BGR images matching the calibration glob patterns"""
+    images = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)):
+            image = cv2.imread(path)
+            if image is not None:
+                images.append(image)
+    if not images:
+        raise FileNotFoundError(f"No calibration images found for {patterns}")
+    return images
+
+
+def letterbox_tensor(image, imgsz=DETECTOR_IMGSZ):
+    """Same preprocessing as the YOLO predictor: letterbox to imgsz, RGB, CHW, 0-1 float"""
+    h, w = image.shape[:2]
+    scale = min(imgsz / h, imgsz / w)
+    nh, nw = int(round(h * scale)), int(round(w * scale))
+    canvas = np.full((imgsz, imgsz, 3), 114, dtype=np.uint8)
+    top, left = (imgsz - nh) // 2, (imgsz - nw) // 2
+    canvas[top:top + nh, left:left + nw] = cv2.resize(image, (nw, nh), interpolation=cv2.INTER_LINEAR)
+    return (canvas[:, :, ::-1].transpose(2, 0, 1).astype(np.float32) / 255.0)[None]
+
+
+def calibration_samples(imgsz=DETECTOR_IMGSZ):
+    """
+    Calibration inputs from the local images, with flipped and cropped variants
+    so a handful of pictures still covers a range of scales and layouts
+    """
+    samples = []
+    for image in calibration_images():
+        h, w = image.shape[:2]
+        variants = [image, cv2.flip(image, 1),
+                    image[:h * 2 // 3, :w * 2 // 3], image[h // 3:, w // 3:],
+                    cv2.convertScaleAbs(image, alpha=0.6, beta=0)]  # Darker exposure
+        samples.extend(letterbox_tensor(v, imgsz) for v in variants)
+    return samples
+
+
+def _export(model_path, fmt, imgsz):
+    """Export the PyTorch model with ultralytics; returns the exported path"""
+    from ultralytics import YOLO
+    print(f"Exporting {model_path} to {fmt}...")
+    # Dynamic batch for both formats, so detect_batch (and the service's MicroBatcher)
+    # can send several frames per call
+    return YOLO(model_path).export(format=fmt, imgsz=imgsz, dynamic=True)
+
+
+def quantize_onnx_int8(onnx_path, imgsz=DETECTOR_IMGSZ):
+    """Static INT8 quantization with ONNX Runtime, calibrated on local images"""
+    import onnx
+    from onnxruntime.quantization import (
+        CalibrationDataReader, QuantFormat, QuantType, quantize_static
+    )
+
+    class _Reader(CalibrationDataReader):
+        def __init__(self, input_name):
+            self._samples = iter(calibration_samples(imgsz))
+            self._input_name = input_name
+
+        def get_next(self):
+            sample = next(self._samples, None)
+            return None if sample is None else {self._input_name: sample}
+
+    out_path = onnx_path.replace(".onnx", "_int8.onnx")
+    source = onnx.load(onnx_path)
+    print(f"Quantizing {onnx_path} to INT8...")
+    # Convolutions only: the detection head's concat/sigmoid/decode stays in float for accuracy
+    quantize_static(onnx_path, out_path, _Reader(source.graph.input[0].name),
+                    quant_format=QuantFormat.QDQ, activation_type=QuantType.QUInt8,
+                    weight_type=QuantType.QInt8, per_channel=True, op_types_to_quantize=["Conv"])
+    # Keep the class names / stride metadata ultralytics reads back
+    quantized = onnx.load(out_path)
+    del quantized.metadata_props[:]
+    quantized.metadata_props.extend(source.metadata_props)
+    onnx.save(quantized, out_path)
+    return out_path
+
+
+def quantize_openvino_int8(model_dir, imgsz=DETECTOR_IMGSZ):
+    """INT8 quantization of an OpenVINO export with NNCF, calibrated on local images"""
+    import nncf
+    import openvino as ov
+
+    xml_path = glob.glob(os.path.join(model_dir, "*.xml"))[0]
+    out_dir = model_dir.rstrip("/\\").replace("_openvino_model", "_int8_openvino_model")
+    os.makedirs(out_dir, exist_ok=True)
+    print(f"Quantizing {xml_path} to INT8...")
+    model = ov.Core().read_model(xml_path)
+    quantized = nncf.quantize(model, nncf.Dataset(calibration_samples(imgsz)),
+                              preset=nncf.QuantizationPreset.MIXED)
+    ov.save_model(quantized, os.path.join(out_dir, os.path.basename(xml_path)))
+    metadata = os.path.join(model_dir, "metadata.yaml")
+    if os.path.exists(metadata):
+        shutil.copy(metadata, out_dir)
+    return out_dir
+
+
+def _has_static_batch(path):
+    """True for an ONNX file / OpenVINO model directory exported with a fixed batch size"""
+    if path.endswith(".onnx"):
+        import onnx
+        dim = onnx.load(path, load_external_data=False).graph.input[0].type.tensor_type.shape.dim[0]
+        return not dim.dim_param
+    import openvino as ov
+    xml_path = glob.glob(os.path.join(path, "*.xml"))[0]
+    return not ov.Core().read_model(xml_path).inputs[0].get_partial_shape()[0].is_dynamic
+
+
+def _reusable(path):
+    """An earlier export that detect_batch can use (exports with a fixed batch are redone)"""
+    if not os.path.exists(path):
+        return False
+    try:
+        static = _has_static_batch(path)
+    except Exception as e:  # Incomplete export directory, unreadable file
+        print(f"⚠️ Could not inspect {path} ({e}); exporting again")
+        return False
+    if static:
+        print(f"⚠️ {path} has a fixed batch size; exporting again")
+    return not static
+
+
+def resolve_model_path(backend=DETECTOR_BACKEND, int8=DETECTOR_INT8,
+                       model_path=MODEL_PATH, imgsz=DETECTOR_IMGSZ):
+    """
+    Model file for a backend, exporting (and quantizing) the PyTorch weights on first use
+    Returns:
+        Path loadable with YOLO(path, task='detect')
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown detector backend: {backend} (expected one of {BACKENDS})")
+    if backend == "pytorch":
+        return model_path
+    stem = os.path.splitext(model_path)[0]
+    if backend == "onnx":
+        path = f"{stem}.onnx"
+        if not _reusable(path):
+            path = _export(model_path, "onnx", imgsz)
+        if int8:
+            int8_path = path.replace(".onnx", "_int8.onnx")
+            path = int8_path if _reusable(int8_path) else quantize_onnx_int8(path, imgsz)
+        return path
+    path = f"{stem}_openvino_model"
+    if not _reusable(path):
+        path = _export(model_path, "openvino", imgsz)
+    if int8:
+        int8_dir = path.rstrip("/\\").replace("_openvino_model", "_int8_openvino_model")
+        path = int8_dir if _reusable(int8_dir) else quantize_openvino_int8(path, imgsz)
+    return path
 
 
 class ObjectDetector:
-    def __init__(self):
-        print(f"Loading YOLOv8 from {MODEL_PATH}...")
-        self.model = YOLO(MODEL_PATH)
-        
-        self.cap = cv2.VideoCapture(CAMERA_INDEX)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
-        
-        if not self.cap.isOpened():
-            raise Exception("Camera error")
+    def __init__(self, frame_source=None, use_camera=True, backend=DETECTOR_BACKEND, int8=DETECTOR_INT8):
+        """
+        Args:
+            frame_source: Shared FrameSource; a private one is opened if omitted
+            use_camera: False for headless use on supplied images (no camera is opened)
+            backend: 'pytorch', 'onnx' or 'openvino' (see resolve_model_path)
+            int8: Use the INT8-quantized export (onnx / openvino only)
+        """
+        from ultralytics import YOLO  # Heavy (pulls in torch); imported on construction
+        self.backend = f"{backend}-int8" if int8 and backend != "pytorch" else backend
+        model_path = resolve_model_path(backend, int8)
+        print(f"Loading YOLOv8 ({self.backend}) from {model_path}...")
+        # Exported models carry no task information; outputs are the same Results objects
+        self.model = YOLO(model_path, task="detect")
+        # The YOLO predictor is not thread-safe; the background worker and commands share it
+        self._model_lock = threading.Lock()
+        self.door_detector = DoorDetector()
         
-        print("✅ Camera initialized")
+        self.owns_source = frame_source is None and use_camera
+        self.frame_source = FrameSource() if self.owns_source else frame_source
+
+    @property
+    def class_names(self):
+        """Every label the model can produce"""
+        return list(self.model.names.values())
 
     def detect(self, frame):
         """Basic YOLO detection"""
-        results = self.model(frame, conf=CONFIDENCE_THRESHOLD, verbose=False)
+        with self._model_lock:
+            results = self.model(frame, conf=CONFIDENCE_THRESHOLD, verbose=False)
         
-        detections = []
         annotated_frame = frame.copy()
+        return self._convert_result(results[0], annotated_frame)
+    
+    def detect_batch(self, frames, annotate=True, batch_size=DETECTION_BATCH_SIZE):
+        """
+        YOLO detection on several frames with one model call per batch
+        Args:
+            frames: List of BGR frames (may differ in size)
+            annotate: Whether to draw boxes on a copy of each frame
+            batch_size: Maximum frames pushed through the model at once
+        Returns:
+            List of (detections, annotated_frame) tuples in input order;
+            annotated_frame is None when annotate=False
+        """
+        frames = list(frames)
+        outputs = []
+        for start in range(0, len(frames), batch_size):
+            chunk = frames[start:start + batch_size]
+            with self._model_lock:
+                results = self.model(chunk, conf=CONFIDENCE_THRESHOLD, verbose=False)
+            for frame, result in zip(chunk, results):
+                annotated_frame = frame.copy() if annotate else None
+                outputs.append(self._convert_result(result, annotated_frame))
+        return outputs
+    
+    def _convert_result(self, result, annotated_frame=None):
+        """
+        Convert one YOLO result to Detections in bulk
+        from the boxes tensors instead of indexing box by box
+        """
+        boxes = result.boxes
+        detections = Detections(
+            boxes.xyxy.cpu().numpy(),
+            boxes.conf.cpu().numpy(),
+            boxes.cls.cpu().numpy(),
+            names=self.model.names
+        )
         
-        for result in results:
-            boxes = result.boxes
-            for box in boxes:
-                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                bbox = [int(x1), int(y1), int(x2), int(y2)]
-                
-                conf = float(box.conf[0])
-                cls = int(box.cls[0])
-                label = self.model.names[cls]
-                
-                detections.append((label, bbox))
-                annotated_frame = draw_bounding_box(annotated_frame, bbox, label, conf)
+        if annotated_frame is not None:
+            for (label, bbox), conf in zip(detections, detections.scores.tolist()):
+                draw_bounding_box(annotated_frame, bbox, label, conf)
         
         return detections, annotated_frame
     
-    def detect_with_doors(self, frame):
+    def add_doors(self, frame, detections, annotated_frame=None, door_rois=None):
+        """Append door detections for frame (and draw them when annotated_frame is given)"""
+        door_boxes = self.door_detector.detect(frame, rois=door_rois)
+        detections = detections.append(door_boxes, source=SOURCE_DOOR)
+
+        if annotated_frame is not None:
+            for bbox in door_boxes:
+                x1, y1, x2, y2 = map(int, bbox)
+                cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), (255, 0, 0), 2)
+                cv2.putText(annotated_frame, "door", (x1, y1-10),
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 2)
+
+        return detections, annotated_frame
+
+    def detect_batch_with_doors(self, frames, annotate=False):
+        """detect_batch plus door detection per frame; same output as detect_with_doors"""
+        frames = list(frames)
+        return [self.add_doors(frame, detections, annotated_frame)
+                for frame, (detections, annotated_frame) in zip(frames, self.detect_batch(frames, annotate))]
+
+    def detect_with_doors(self, frame, door_rois=None):
         """
         YOLO detection + Door detection
         THIS IS THE METHOD YOU SHOULD USE
+        Args:
+            frame: BGR frame
+            door_rois: Optional [x1, y1, x2, y2] regions to limit the door search to
         """
         # Get YOLO detections
         detections, annotated_frame = self.detect(frame)
         
         # Add door detections
-        door_boxes = detect_door_shapes(frame)
-        
-        for bbox in door_boxes:
-            detections.append(("door", bbox))
-            
-            x1, y1, x2, y2 = map(int, bbox)
-            cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), (255, 0, 0), 2)
-            cv2.putText(annotated_frame, "door", (x1, y1-10), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 2)
-        
-        return detections, annotated_frame
+        return self.add_doors(frame, detections, annotated_frame, door_rois)
 
     def get_frame(self):
-        """Get camera frame"""
-        return self.cap.read()
+        """Get latest camera frame (non-blocking)"""
+        if self.frame_source is None:
+            return False, None
+        return self.frame_source.read()
 
     def release(self):
         """Release camera"""
-        self.cap.release()
+        if self.owns_source:
+            self.frame_source.release()
         cv2.destroyAllWindows()
-        print("Camera released")
+
+
+def _agreement(reference, candidate, iou_threshold=0.5):
+    """
+    How closely candidate detections reproduce the reference ones
+    Returns:
+        Tuple of (matched, reference_total, extra, mean_iou) over all images
+    """
+    from core.tracking import iou_matrix
+    matched = total = extra = 0
+    ious = []
+    for ref, cand in zip(reference, candidate):
+        total += len(ref)
+        used = set()
+        if len(ref) and len(cand):
+            overlap = iou_matrix(ref.boxes, cand.boxes)
+            ref_labels, cand_labels = ref.labels, cand.labels
+            for i, label in enumerate(ref_labels):
+                best, best_iou = None, iou_threshold
+                for j, cand_label in enumerate(cand_labels):
+                    if j not in used and cand_label == label and overlap[i, j] >= best_iou:
+                        best, best_iou = j, overlap[i, j]
+                if best is not None:
+                    used.add(best)
+                    matched += 1
+                    ious.append(best_iou)
+        extra += len(cand) - len(used)
+    return matched, total, extra, float(np.mean(ious)) if ious else float("nan")
+
+
+# Accuracy / latency comparison of the backends against PyTorch
+if __name__ == "__main__":
+    import sys
+    import time
+
+    # Images to evaluate on (defaults to the calibration images; pass others to avoid that overlap)
+    images = calibration_images(sys.argv[1:] or DETECTOR_CALIBRATION_IMAGES)
+    runs = 10
+    reference = None
+    # detect_batch sends DETECTION_BATCH_SIZE frames per call (needs a dynamic-batch export)
+    batch = (images * DETECTION_BATCH_SIZE)[:DETECTION_BATCH_SIZE]
+    print(f"{'backend':15} {'ms/frame':>9} {'batched':>8} {'matched':>9} {'extra':>6} {'mean IoU':>9}")
+    for backend, int8 in [("pytorch", False), ("onnx", False), ("onnx", True),
+                          ("openvino", False), ("openvino", True)]:
+        name = f"{backend}-int8" if int8 else backend
+        try:
+            detector = ObjectDetector(use_camera=False, backend=backend, int8=int8)
+        except Exception as e:  # Runtime or export tooling not installed
+            print(f"{name:15} unavailable: {e}")
+            continue
+        outputs = [detector.detect(image)[0] for image in images]  # Also warms up
+        start = time.perf_counter()
+        for _ in range(runs):
+            for image in images:
+                detector.detect(image)
+        ms = (time.perf_counter() - start) / (runs * len(images)) * 1000
+        detector.detect_batch(batch, annotate=False)
+        start = time.perf_counter()
+        for _ in range(runs):
+            detector.detect_batch(batch, annotate=False)
+        batched_ms = (time.perf_counter() - start) / (runs * len(batch)) * 1000
+        if reference is None:
+            reference = outputs
+        matched, total, extra, mean_iou = _agreement(reference, outputs)
+        print(f"{name:15} {ms:9.1f} {batched_ms:8.1f} {f'{matched}/{total}':>9} {extra:6d} {mean_iou:9.3f}")
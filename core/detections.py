@@ -0,0 +1,159 @@
+"""
+Detections Container for Vision Assistant
+Array-backed detections with vectorized position, angle and distance helpers
+"""
+
+import numpy as np
+
+SOURCE_YOLO = 0
+SOURCE_DOOR = 1
+
+DOOR_LABEL = "door"
+DOOR_CLASS_ID = -1
+
+HORIZONTAL_FOV = 60  # Degrees, matches calculate_angle_from_center
+
+
+class Detections:
+    """
+    Compact set of detections for one frame
+    Iterating yields (label, [x1, y1, x2, y2]) tuples so code written for the
+    old list-of-tuples format keeps working.
+    """
+    __slots__ = ("boxes", "scores", "class_ids", "sources", "names")
+
+    def __init__(self, boxes=None, scores=None, class_ids=None, sources=None, names=None):
+        """
+        Args:
+            boxes: (N, 4) array-like of x1, y1, x2, y2 pixel coordinates
+            scores: (N,) confidences (default 1.0)
+            class_ids: (N,) model class ids (default DOOR_CLASS_ID)
+            sources: (N,) SOURCE_YOLO / SOURCE_DOOR (default SOURCE_YOLO)
+            names: Mapping of class id -> label (e.g. YOLO model.names)
+        """
+        self.boxes = np.asarray(boxes if boxes is not None else [], dtype=np.int32).reshape(-1, 4)
+        n = len(self.boxes)
+        self.scores = (np.asarray(scores, dtype=np.float32) if scores is not None
+                       else np.ones(n, dtype=np.float32))
+        self.class_ids = (np.asarray(class_ids, dtype=np.int16) if class_ids is not None
+                          else np.full(n, DOOR_CLASS_ID, dtype=np.int16))
+        self.sources = (np.asarray(sources, dtype=np.uint8) if sources is not None
+                        else np.full(n, SOURCE_YOLO, dtype=np.uint8))
+        self.names = names if names is not None else {}
+
+    @classmethod
+    def from_list(cls, detections):
+        """Build from a list of (label, bbox) tuples"""
+        if isinstance(detections, cls):
+            return detections
+        names = {}
+        class_ids, sources, boxes = [], [], []
+        for label, bbox in detections:
+            if label == DOOR_LABEL:
+                class_ids.append(DOOR_CLASS_ID)
+                sources.append(SOURCE_DOOR)
+            else:
+                class_ids.append(names.setdefault(label, len(names)))
+                sources.append(SOURCE_YOLO)
+            boxes.append(bbox)
+        return cls(boxes, None, class_ids, sources, {cid: label for label, cid in names.items()})
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def __iter__(self):
+        return iter(zip(self.labels, self.boxes.tolist()))
+
+    def __getitem__(self, index):
+        return self.labels[index], self.boxes[index].tolist()
+
+    def __repr__(self):
+        return f"Detections({list(self)})"
+
+    @property
+    def labels(self):
+        """Label of every detection, in order"""
+        names = self.names
+        return [DOOR_LABEL if src == SOURCE_DOOR else names[cid]
+                for cid, src in zip(self.class_ids.tolist(), self.sources.tolist())]
+
+    def select(self, mask):
+        """Subset by boolean mask or index array"""
+        return Detections(self.boxes[mask], self.scores[mask], self.class_ids[mask],
+                          self.sources[mask], self.names)
+
+    def append(self, boxes, source=SOURCE_DOOR, class_id=DOOR_CLASS_ID, score=1.0):
+        """Return a new Detections with extra boxes from one source"""
+        boxes = np.asarray(boxes, dtype=np.int32).reshape(-1, 4)
+        n = len(boxes)
+        return Detections(
+            np.concatenate([self.boxes, boxes]),
+            np.concatenate([self.scores, np.full(n, score, dtype=np.float32)]),
+            np.concatenate([self.class_ids, np.full(n, class_id, dtype=np.int16)]),
+            np.concatenate([self.sources, np.full(n, source, dtype=np.uint8)]),
+            self.names
+        )
+
+    def match(self, object_name):
+        """Boolean mask of detections whose label contains or is contained in object_name"""
+        name = object_name.lower()
+        label_matches = {label: (name in label.lower() or label.lower() in name)
+                         for label in set(self.labels)}
+        return np.array([label_matches[label] for label in self.labels], dtype=bool)
+
+    # --- Vectorized geometry -------------------------------------------------
+
+    def centers_x(self):
+        return (self.boxes[:, 0] + self.boxes[:, 2]) / 2
+
+    def widths(self):
+        return self.boxes[:, 2] - self.boxes[:, 0]
+
+    def heights(self):
+        return self.boxes[:, 3] - self.boxes[:, 1]
+
+    def size_ratios(self, frame_width, frame_height):
+        """Box area as a fraction of the frame area"""
+        return (self.widths() * self.heights()) / float(frame_width * frame_height)
+
+    def directions(self, frame_width):
+        """'on your left' / 'straight ahead' / 'on your right' per detection"""
+        cx = self.centers_x()
+        return np.select(
+            [cx < frame_width * 0.33, cx > frame_width * 0.66],
+            ["on your left", "on your right"],
+            "straight ahead"
+        )
+
+    def distance_categories(self, frame_width, frame_height):
+        """Coarse spoken distance from size ratio, same bands as get_position_info"""
+        ratio = self.size_ratios(frame_width, frame_height)
+        return np.select(
+            [ratio > 0.15, ratio > 0.05, ratio > 0.02],
+            ["very close", "close", "at medium distance"],
+            "far away"
+        )
+
+    def spatial_info(self, frame_width, frame_height):
+        """List of (label, direction, distance) for generate_spatial_description"""
+        return list(zip(self.labels,
+                        self.directions(frame_width).tolist(),
+                        self.distance_categories(frame_width, frame_height).tolist()))
+
+    def angles_from_center(self, frame_width, horizontal_fov=HORIZONTAL_FOV):
+        """Whole-degree angles, same as calculate_angle_from_center"""
+        offset = self.centers_x() - frame_width / 2
+        return np.trunc(offset / frame_width * horizontal_fov).astype(int)
+
+    def center_angles(self, frame_width, hfov_deg=HORIZONTAL_FOV):
+        """Fractional angles, same as app.calc_center_angle"""
+        rel_center = (self.centers_x() - frame_width / 2) / (frame_width / 2)
+        return rel_center * (hfov_deg / 2)
+
+    def distances_m(self, known_width=90, focal_length=580):
+        """Pinhole distance estimates in meters (NaN for zero-width boxes)"""
+        width_pixels = np.abs(self.widths()).astype(float)
+        with np.errstate(divide="ignore"):
+            distance = (known_width * focal_length) / width_pixels / 100
+        distance[width_pixels <= 0] = np.nan
+        return distance
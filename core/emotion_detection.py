@@ -1,28 +1,146 @@
 """
 Emotion Detection Module for Vision Assistant
 Uses DeepFace for facial emotion analysis (real-time, plug-and-play)
+Faces are located cheaply (inside YOLO person boxes when available) and analyzed in one batch
 """
 
 import cv2
-from deepface import DeepFace
+import numpy as np
+from core.camera import FrameSource
+from core.config import EMOTION_FACE_SIZE, EMOTION_HEAD_FRACTION, EMOTION_MAX_FACES
 
 class EmotionDetector:
-    def __init__(self, camera_index=0):
+    def __init__(self, camera_index=0, frame_source=None, use_camera=True):
         print("Initializing EmotionDetector...")
-        self.cap = cv2.VideoCapture(camera_index)
-        if not self.cap.isOpened():
-            raise Exception("Camera error: Unable to access webcam.")
+        from deepface import DeepFace  # Heavy (pulls in TensorFlow); imported on construction
+        self.deepface = DeepFace
+        # Share the app's capture thread when given one instead of opening the device twice
+        # use_camera=False: headless analysis of supplied images only
+        self.owns_source = frame_source is None and use_camera
+        if self.owns_source:
+            try:
+                frame_source = FrameSource(camera_index)
+            except Exception:
+                raise Exception("Camera error: Unable to access webcam.")
+        self.frame_source = frame_source
+        # Haar cascades are cheap but were dropped from some OpenCV builds
+        if hasattr(cv2, "CascadeClassifier"):
+            self.face_cascade = cv2.CascadeClassifier(
+                cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+        else:
+            self.face_cascade = None
+        self.batch_supported = True
+        self._warm_up()
         print("✅ EmotionDetector ready")
 
+    def _warm_up(self):
+        """Load the emotion model now so the first real request does not pay for it"""
+        dummy = np.zeros((EMOTION_FACE_SIZE, EMOTION_FACE_SIZE, 3), dtype=np.uint8)
+        try:
+            self.deepface.analyze(dummy, actions=['emotion'], detector_backend='skip',
+                                  enforce_detection=False, silent=True)
+        except Exception as e:
+            print(f"⚠️ Emotion warm-up failed: {e}")
+
     def get_frame(self):
-        """Grab a frame from the camera."""
-        ret, frame = self.cap.read()
-        return ret, frame
+        """Grab the latest frame from the camera."""
+        if self.frame_source is None:
+            return False, None
+        return self.frame_source.read()
+
+    def find_faces(self, frame, person_boxes=None):
+        """
+        Locate faces with a Haar cascade (DeepFace's detector if OpenCV lacks one)
+        Args:
+            frame: BGR frame
+            person_boxes: Optional YOLO person boxes; only their head region is searched
+        Returns:
+            List of [x1, y1, x2, y2] face boxes, largest first
+        """
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        h, w = gray.shape[:2]
+        if person_boxes:
+            regions = []
+            for x1, y1, x2, y2 in person_boxes:
+                head_bottom = y1 + int((y2 - y1) * EMOTION_HEAD_FRACTION)
+                regions.append((max(0, int(x1)), max(0, int(y1)), min(w, int(x2)), min(h, head_bottom)))
+        else:
+            regions = [(0, 0, w, h)]
+
+        faces = []
+        for x1, y1, x2, y2 in regions:
+            if x2 - x1 < 24 or y2 - y1 < 24:
+                continue
+            for fx, fy, fw, fh in self._faces_in(frame[y1:y2, x1:x2], gray[y1:y2, x1:x2]):
+                faces.append([x1 + fx, y1 + fy, x1 + fx + fw, y1 + fy + fh])
+        faces.sort(key=lambda b: (b[2] - b[0]) * (b[3] - b[1]), reverse=True)
+        return faces[:EMOTION_MAX_FACES]
+
+    def _faces_in(self, region, region_gray):
+        """(x, y, w, h) faces inside one region"""
+        if self.face_cascade is not None:
+            return self.face_cascade.detectMultiScale(region_gray, scaleFactor=1.1,
+                                                      minNeighbors=5, minSize=(24, 24))
+        found = self.deepface.extract_faces(region, detector_backend='opencv', enforce_detection=False)
+        # With enforce_detection=False a miss comes back as the whole region at confidence 0
+        return [(f["facial_area"]["x"], f["facial_area"]["y"], f["facial_area"]["w"], f["facial_area"]["h"])
+                for f in found if f.get("confidence", 0) > 0]
+
+    def _analyze_crops(self, crops):
+        """Emotion analysis for face crops, batched into one DeepFace call when supported"""
+        faces = [cv2.resize(crop, (EMOTION_FACE_SIZE, EMOTION_FACE_SIZE)) for crop in crops]
+        if self.batch_supported and len(faces) > 1:
+            try:
+                results = self.deepface.analyze(np.stack(faces), actions=['emotion'], detector_backend='skip',
+                                                enforce_detection=False, silent=True)
+                if len(results) == len(faces):
+                    # Batched calls return one list of faces per input image
+                    return [r[0] if isinstance(r, list) else r for r in results]
+            except Exception:
+                pass
+            # Older DeepFace versions only take one image per call
+            self.batch_supported = False
+        results = []
+        for face in faces:
+            result = self.deepface.analyze(face, actions=['emotion'], detector_backend='skip',
+                                           enforce_detection=False, silent=True)
+            results.append(result[0] if isinstance(result, list) else result)
+        return results
 
-    def detect_emotion(self, frame):
-        """Run emotion detection on input frame."""
+    def detect_emotions(self, frame, person_boxes=None):
+        """
+        Per-face emotion analysis
+        Args:
+            frame: BGR frame
+            person_boxes: Optional YOLO person boxes used to narrow the face search
+        Returns:
+            List of dicts with 'box', 'emotion' and 'scores', largest face first
+        """
+        faces = self.find_faces(frame, person_boxes)
+        if not faces:
+            return []
         try:
-            result = DeepFace.analyze(frame, actions=['emotion'], enforce_detection=False)
+            analyses = self._analyze_crops([frame[y1:y2, x1:x2] for x1, y1, x2, y2 in faces])
+        except Exception as e:
+            print(f"⚠️ Emotion detection error: {e}")
+            return []
+        return [
+            {"box": box, "emotion": a.get("dominant_emotion", "unknown"), "scores": a.get("emotion", {})}
+            for box, a in zip(faces, analyses)
+        ]
+
+    def detect_emotion(self, frame, person_boxes=None):
+        """Run emotion detection on input frame (dominant emotion of the largest face)."""
+        faces = self.detect_emotions(frame, person_boxes)
+        if faces:
+            return faces[0]["emotion"]
+        # No face found by the cascade; let DeepFace search the full frame as before
+        return self.analyze_full_frame(frame)
+
+    def analyze_full_frame(self, frame):
+        """Original whole-frame DeepFace analysis (DeepFace does its own face search)."""
+        try:
+            result = self.deepface.analyze(frame, actions=['emotion'], enforce_detection=False)
             # Safe extraction for both list and dict results
             if isinstance(result, dict) and "dominant_emotion" in result:
                 emotion = result["dominant_emotion"]
@@ -41,10 +159,20 @@ class EmotionDetector:
                     cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
         return frame
 
+    def annotate_faces(self, frame, faces):
+        """Draw each face box with its emotion label."""
+        for face in faces:
+            x1, y1, x2, y2 = face["box"]
+            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 255), 2)
+            cv2.putText(frame, face["emotion"], (x1, max(15, y1 - 8)),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+        return frame
+
     def release(self):
-        self.cap.release()
+        if self.owns_source:
+            self.frame_source.release()
+            print("Camera released (EmotionDetector)")
         cv2.destroyAllWindows()
-        print("Camera released (EmotionDetector)")
 
 # Usage demo
 if __name__ == "__main__":
@@ -53,10 +181,10 @@ if __name__ == "__main__":
         ret, frame = detector.get_frame()
         if not ret:
             break
-        emotion = detector.detect_emotion(frame)
-        annotated = detector.annotate_frame(frame, emotion)
+        faces = detector.detect_emotions(frame)
+        annotated = detector.annotate_faces(frame, faces)
         cv2.imshow("Emotion Detection", annotated)
-        print(f"Emotion: {emotion}")
+        print(f"Emotions: {[face['emotion'] for face in faces]}")
         if cv2.waitKey(1) & 0xFF == ord('q'):
             break
     detector.release()
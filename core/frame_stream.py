@@ -0,0 +1,157 @@
+"""
+Frame Stream Module for Vision Assistant
+The app publishes the frame it displays as one JPEG file (encoded once, rate-limited,
+replaced atomically); the web server watches that file and shares the bytes with every viewer
+"""
+
+import os
+import threading
+import time
+
+import cv2
+from core.config import (
+    WEB_FRAME_PATH, WEB_FRAME_QUALITY, WEB_FRAME_MAX_WIDTH, WEB_FRAME_INTERVAL, WEB_FRAME_POLL
+)
+
+
+class FramePublisher:
+    """App side: encodes the newest displayed frame on a background thread at most every interval"""
+
+    def __init__(self, path=WEB_FRAME_PATH, quality=WEB_FRAME_QUALITY,
+                 max_width=WEB_FRAME_MAX_WIDTH, interval=WEB_FRAME_INTERVAL):
+        """
+        Args:
+            path: JPEG file the web server watches
+            quality: JPEG quality (0-100)
+            max_width: Frames wider than this are downscaled before encoding
+            interval: Minimum seconds between published frames
+        """
+        self.path = path
+        self.quality = quality
+        self.max_width = max_width
+        self.interval = interval
+        self.published = 0
+        self._pending = None
+        self._cond = threading.Condition()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.running = True
+        self._thread = threading.Thread(target=self._publish_loop, daemon=True)
+        self._thread.start()
+
+    def publish(self, frame):
+        """Hand over a frame (not copied; do not modify it afterwards). Older pending frames are dropped."""
+        with self._cond:
+            self._pending = frame
+            self._cond.notify()
+
+    def encode(self, frame):
+        h, w = frame.shape[:2]
+        if w > self.max_width:
+            frame = cv2.resize(frame, (self.max_width, int(h * self.max_width / w)),
+                               interpolation=cv2.INTER_AREA)
+        ok, jpeg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        return jpeg.tobytes() if ok else None
+
+    def _write(self, data):
+        # Write beside the target and rename, so readers never see a partial JPEG
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self.path)
+
+    def _publish_loop(self):
+        last = 0.0
+        while self.running:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or not self.running)
+                if not self.running:
+                    break
+            # Rate limit: frames arriving meanwhile just replace the pending one
+            delay = last + self.interval - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            with self._cond:
+                frame, self._pending = self._pending, None
+            try:
+                data = self.encode(frame)
+                if data:
+                    self._write(data)
+                    self.published += 1
+            except Exception as e:
+                print(f"⚠️ Frame publish failed: {e}")
+            last = time.time()
+
+    def stop(self):
+        with self._cond:
+            self.running = False
+            self._cond.notify()
+        self._thread.join(timeout=1.0)
+
+
+class FrameWatcher:
+    """Web side: one thread reloads the published JPEG when its mtime changes"""
+
+    def __init__(self, path=WEB_FRAME_PATH, fallback_path="image.jpg", poll_interval=WEB_FRAME_POLL):
+        """
+        Args:
+            path: JPEG written by FramePublisher
+            fallback_path: Static image served until the app publishes a frame
+            poll_interval: Seconds between mtime checks
+        """
+        self.path = path
+        self.fallback_path = fallback_path
+        self.poll_interval = poll_interval
+        self.jpeg = None
+        self.etag = None
+        self.seq = 0
+        self._mtime = None
+        self._cond = threading.Condition()
+        self._load_fallback()
+        self.running = True
+        self._thread = threading.Thread(target=self._watch_loop, daemon=True)
+        self._thread.start()
+
+    def _load_fallback(self):
+        try:
+            with open(self.fallback_path, "rb") as f:
+                self._set(f.read(), os.stat(self.fallback_path).st_mtime_ns)
+        except FileNotFoundError:
+            pass
+
+    def _set(self, data, mtime_ns):
+        with self._cond:
+            self.jpeg = data
+            self.seq += 1
+            self.etag = f"{mtime_ns:x}-{len(data):x}"
+            self._cond.notify_all()
+
+    def _watch_loop(self):
+        while self.running:
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+                if mtime != self._mtime:
+                    with open(self.path, "rb") as f:
+                        data = f.read()
+                    self._mtime = mtime
+                    if data:
+                        self._set(data, mtime)
+            except FileNotFoundError:
+                pass
+            time.sleep(self.poll_interval)
+
+    def latest(self):
+        """Tuple of (jpeg_bytes, etag, seq); jpeg is None when nothing is available"""
+        with self._cond:
+            return self.jpeg, self.etag, self.seq
+
+    def wait(self, seq, timeout):
+        """latest(), blocking up to timeout seconds for a frame newer than seq"""
+        with self._cond:
+            self._cond.wait_for(lambda: self.seq != seq, timeout)
+            return self.jpeg, self.etag, self.seq
+
+    def stop(self):
+        self.running = False
+        self._thread.join(timeout=1.0)
@@ -0,0 +1,234 @@
+"""
+Intent Matching Module for Vision Assistant
+Compiles every command phrase and object name into one word-level Aho-Corasick automaton,
+so a transcript resolves to a single intent (plus slots) in one pass over its words
+"""
+
+import re
+from collections import deque, namedtuple
+
+from core.config import (
+    DESCRIBE_COMMANDS, REPEAT_COMMANDS, EXIT_COMMANDS, OBJECT_QUERY_KEYWORDS,
+    QUERYABLE_OBJECTS, NON_DETECTABLE_OBJECTS, OBJECT_SYNONYMS,
+    READ_TEXT_COMMANDS, READING_MODE_COMMANDS, EMOTION_COMMANDS, NEGATION_WORDS, FILLER_WORDS
+)
+
+INTENT_READING = "reading"
+INTENT_FIND_OBJECT = "find_object"
+INTENT_EXIT = "exit"
+INTENT_READ_TEXT = "read_text"
+INTENT_EMOTION = "emotion"
+INTENT_REPEAT = "repeat"
+INTENT_DESCRIBE = "describe"
+
+# When a transcript holds several commands the most specific one wins
+INTENT_PRIORITY = [INTENT_READING, INTENT_FIND_OBJECT, INTENT_EXIT, INTENT_READ_TEXT,
+                   INTENT_EMOTION, INTENT_REPEAT, INTENT_DESCRIBE]
+
+# Phrase kinds stored in the automaton
+KIND_COMMAND = "command"
+KIND_QUERY = "query"
+KIND_OBJECT = "object"
+KIND_NEGATION = "negation"
+
+# Words never taken as an unknown object name after a query keyword
+_FILLER = frozenset(FILLER_WORDS)
+
+Intent = namedtuple("Intent", ["name", "slots"])
+NO_INTENT = Intent(None, {})
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(text.lower())
+
+
+class PhraseAutomaton:
+    """Aho-Corasick automaton over word sequences (matches respect word boundaries)"""
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]  # node -> [(phrase length in words, payload)]
+        self._built = False
+
+    def add(self, phrase, payload):
+        node = 0
+        words = tokenize(phrase)
+        for word in words:
+            nxt = self._goto[node].get(word)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][word] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        if words:
+            self._out[node].append((len(words), payload))
+        self._built = False
+
+    def build(self):
+        """Compute failure links breadth-first and merge suffix outputs"""
+        queue = deque(self._goto[0].values())  # Depth-1 nodes fail to the root
+        while queue:
+            node = queue.popleft()
+            for word, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and word not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(word, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+                queue.append(child)
+        self._built = True
+
+    def search(self, words):
+        """
+        Returns:
+            List of (start, end, payload) for every phrase occurrence, end exclusive
+        """
+        if not self._built:
+            self.build()
+        matches = []
+        node = 0
+        for i, word in enumerate(words):
+            while node and word not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(word, 0)
+            for length, payload in self._out[node]:
+                matches.append((i + 1 - length, i + 1, payload))
+        return matches
+
+
+def _leftmost_longest(matches):
+    """Non-overlapping spans, preferring the earliest then longest; payloads of one span are kept together"""
+    spans = {}
+    for start, end, payload in matches:
+        spans.setdefault((start, end), []).append(payload)
+    chosen = []
+    position = 0
+    for (start, end) in sorted(spans, key=lambda s: (s[0], -(s[1] - s[0]))):
+        if start >= position:
+            chosen.append((start, end, spans[(start, end)]))
+            position = end
+    return chosen
+
+
+class IntentMatcher:
+    def __init__(self, extra_objects=()):
+        """
+        Args:
+            extra_objects: Additional object names (e.g. the detector's class names)
+        """
+        self.automaton = PhraseAutomaton()
+        commands = [
+            (INTENT_DESCRIBE, DESCRIBE_COMMANDS), (INTENT_REPEAT, REPEAT_COMMANDS),
+            (INTENT_EXIT, EXIT_COMMANDS), (INTENT_READ_TEXT, READ_TEXT_COMMANDS),
+            (INTENT_READING, READING_MODE_COMMANDS), (INTENT_EMOTION, EMOTION_COMMANDS),
+        ]
+        for intent, phrases in commands:
+            for phrase in phrases:
+                self.automaton.add(phrase, (KIND_COMMAND, intent))
+        for phrase in OBJECT_QUERY_KEYWORDS:
+            self.automaton.add(phrase, (KIND_QUERY, phrase))
+        for phrase in NEGATION_WORDS:
+            self.automaton.add(phrase, (KIND_NEGATION, phrase))
+        for name in list(QUERYABLE_OBJECTS) + list(NON_DETECTABLE_OBJECTS) + list(extra_objects):
+            self.automaton.add(name, (KIND_OBJECT, OBJECT_SYNONYMS.get(name.lower(), name.lower())))
+        for synonym, canonical in OBJECT_SYNONYMS.items():
+            self.automaton.add(synonym, (KIND_OBJECT, canonical))
+        self.automaton.build()
+
+    def match(self, text):
+        """
+        Resolve a transcript to one intent
+        Returns:
+            Intent(name, slots); name is None when nothing applies.
+            find_object slots: 'object' (canonical name) and 'known' (from the vocabulary)
+            reading slots: 'enabled'
+        """
+        words = tokenize(text)
+        commands = set()
+        command_words = set()  # Positions of command phrases, never taken as an object name
+        negated = False
+        query_end = None
+        obj = None
+        for start, end, payloads in _leftmost_longest(self.automaton.search(words)):
+            for kind, value in payloads:
+                if kind == KIND_COMMAND:
+                    commands.add(value)
+                    command_words.update(range(start, end))
+                elif kind == KIND_QUERY:
+                    query_end = end if query_end is None else query_end
+                elif kind == KIND_NEGATION:
+                    negated = True
+                elif kind == KIND_OBJECT and obj is None:
+                    obj = value
+
+        if INTENT_READING in commands:
+            return Intent(INTENT_READING, {"enabled": not (negated or INTENT_EXIT in commands)})
+        if query_end is not None:
+            if obj is not None:
+                return Intent(INTENT_FIND_OBJECT, {"object": obj, "known": True})
+            # Unknown object: first content word after the query keyword ("where is my wallet");
+            # command words fall through, so "is there any text" still reads text
+            for position in range(query_end, len(words)):
+                word = words[position]
+                if position not in command_words and word not in _FILLER and len(word) > 2:
+                    return Intent(INTENT_FIND_OBJECT, {"object": word, "known": False})
+        for intent in INTENT_PRIORITY:
+            if intent in commands:
+                return Intent(intent, {})
+        return NO_INTENT
+
+
+_default_matcher = None
+
+
+def default_matcher():
+    """Shared matcher built from config (no extra object names)"""
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = IntentMatcher()
+    return _default_matcher
+
+
+# Benchmark: compiled matching vs. linear keyword scans as the vocabulary grows
+if __name__ == "__main__":
+    import random
+    import time
+
+    def linear_match(command, objects):
+        """The previous voice_listener dispatch: substring scans over each list"""
+        if any(kw in command for kw in OBJECT_QUERY_KEYWORDS):
+            for obj in objects:
+                if obj in command:
+                    return obj
+        return None
+
+    random.seed(0)
+    print("Vocabulary | compiled (µs/query) | linear (µs/query)")
+    for size in (100, 1000, 10000, 50000):
+        objects = [f"object{i} thing" for i in range(size)]
+        matcher = IntentMatcher(extra_objects=objects)
+        queries = [f"where is the {random.choice(objects)} please" for _ in range(500)]
+        queries += ["describe what you see", "read the text", "stop reading", "repeat that"] * 50
+
+        start = time.perf_counter()
+        compiled = [matcher.match(q) for q in queries]
+        compiled_us = (time.perf_counter() - start) / len(queries) * 1e6
+
+        start = time.perf_counter()
+        for q in queries:
+            linear_match(q, objects)
+        linear_us = (time.perf_counter() - start) / len(queries) * 1e6
+        print(f"{size:>10} | {compiled_us:>19.1f} | {linear_us:>17.1f}")
+
+    matcher = IntentMatcher()
+    for sample in ["what do you see", "where is my phone", "is there a sofa",
+                   "where is the exit", "exit", "stop reading", "reading mode",
+                   "what does the text say", "where is my wallet", "how am I feeling emotion",
+                   "is there any text", "can you see any text", "find the text",
+                   "show me my emotion", "can you see my keys"]:
+        print(f"{sample!r:32} -> {matcher.match(sample)}")
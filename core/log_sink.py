@@ -0,0 +1,203 @@
+"""
+Log Sink Module for Vision Assistant
+Buffered stdout mirror and structured (JSONL) event log, written by a background thread
+with size-based rotation so printing never touches the disk on the caller's thread
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+
+from core.config import (
+    LOG_FILE, LOG_EVENTS_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT,
+    LOG_FLUSH_INTERVAL, LOG_BUFFER_BYTES
+)
+
+
+class RotatingFile:
+    """Append-only file kept open; rolled over to path.1 .. path.N when it reaches max_bytes"""
+
+    def __init__(self, path, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file = open(path, "ab")
+        self._size = self._file.tell()
+
+    def write(self, data):
+        data = data.encode("utf-8")
+        if self._size and self._size + len(data) > self.max_bytes:
+            self.rotate()
+        self._file.write(data)
+        self._size += len(data)
+
+    def rotate(self):
+        self._file.close()
+        mode = "ab"
+        try:
+            if self.backup_count > 0:
+                for i in range(self.backup_count - 1, 0, -1):
+                    older = f"{self.path}.{i}"
+                    if os.path.exists(older):
+                        os.replace(older, f"{self.path}.{i + 1}")
+                os.replace(self.path, f"{self.path}.1")
+            else:
+                mode = "wb"
+        except OSError as e:
+            # E.g. another process holds the file open on Windows; keep appending and
+            # retry once another max_bytes have been written (not print: stdout is this log)
+            sys.__stderr__.write(f"⚠️ Log rotation of {self.path} failed: {e}\n")
+        finally:
+            self._file = open(self.path, mode)
+            self._size = 0
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class LogSink:
+    """
+    File-like stdout replacement: text is echoed to the console and buffered in memory;
+    a background thread appends the buffer to the log file every flush_interval seconds
+    (sooner once buffer_bytes accumulate)
+    """
+
+    encoding = "utf-8"
+
+    def __init__(self, path=LOG_FILE, events_path=LOG_EVENTS_FILE, max_bytes=LOG_MAX_BYTES,
+                 backup_count=LOG_BACKUP_COUNT, flush_interval=LOG_FLUSH_INTERVAL,
+                 buffer_bytes=LOG_BUFFER_BYTES, console=sys.__stdout__):
+        """
+        Args:
+            path: Plain-text log (what the web dashboard shows)
+            events_path: JSONL log of structured events (None to disable)
+            console: Stream that still receives every write immediately (None for file only)
+        """
+        self.console = console
+        self.flush_interval = flush_interval
+        self.buffer_bytes = buffer_bytes
+        self._text = RotatingFile(path, max_bytes, backup_count)
+        self._events = RotatingFile(events_path, max_bytes, backup_count) if events_path else None
+        self._pending_text = []
+        self._pending_events = []
+        self._pending_size = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self.running = True
+        self._thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._thread.start()
+
+    def write(self, msg):
+        if self.console is not None:
+            self.console.write(msg)
+        with self._lock:
+            self._pending_text.append(msg)
+            self._pending_size += len(msg)
+            full = self._pending_size >= self.buffer_bytes
+        if full:
+            self._wake.set()
+        return len(msg)
+
+    def flush(self):
+        # Files are flushed by the background thread; only the console is flushed here
+        if self.console is not None:
+            self.console.flush()
+
+    def isatty(self):
+        return False
+
+    def event(self, kind, **fields):
+        """Record a structured event, e.g. event('narration', text='...')"""
+        if self._events is None:
+            return
+        record = {"ts": round(time.time(), 3), "event": kind}
+        record.update(fields)
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            self._pending_events.append(line)
+            self._pending_size += len(line)
+
+    def _drain(self):
+        with self._lock:
+            text, self._pending_text = self._pending_text, []
+            events, self._pending_events = self._pending_events, []
+            self._pending_size = 0
+        if text:
+            self._text.write("".join(text))
+            self._text.flush()
+        if events:
+            self._events.write("".join(events))
+            self._events.flush()
+
+    def _flush_loop(self):
+        while self.running:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self._drain()
+            except Exception as e:
+                if self.console is not None:
+                    self.console.write(f"⚠️ Log write failed: {e}\n")
+
+    def close(self):
+        if not self.running:
+            return
+        self.running = False
+        self._wake.set()
+        self._thread.join(timeout=2.0)
+        self._drain()
+        self._text.close()
+        if self._events is not None:
+            self._events.close()
+
+
+_sink = None
+
+
+def install(**kwargs):
+    """Replace sys.stdout with a LogSink (flushed and closed at exit)"""
+    global _sink
+    if _sink is None:
+        _sink = LogSink(**kwargs)
+        sys.stdout = _sink
+        atexit.register(_sink.close)
+    return _sink
+
+
+def log_event(kind, **fields):
+    """Structured event on the installed sink; no-op when logging is not installed"""
+    if _sink is not None:
+        _sink.event(kind, **fields)
+
+
+# Benchmark: per-print cost of the buffered sink vs. open/append/close per write
+if __name__ == "__main__":
+    import tempfile
+
+    lines = [f"📢 I see one person straight ahead, about 2 meters away ({i})\n" for i in range(20000)]
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        for line in lines:
+            with open(os.path.join(tmp, "legacy.log"), "a") as f:
+                f.write(line)
+        legacy_us = (time.perf_counter() - start) / len(lines) * 1e6
+
+        sink = LogSink(os.path.join(tmp, "out.log"), os.path.join(tmp, "events.jsonl"),
+                       max_bytes=256 * 1024, console=None)
+        start = time.perf_counter()
+        for line in lines:
+            sink.write(line)
+        buffered_us = (time.perf_counter() - start) / len(lines) * 1e6
+        sink.close()
+        files = sorted(os.listdir(tmp))
+        sizes = {name: os.path.getsize(os.path.join(tmp, name)) for name in files}
+
+    print(f"open/append/close per write: {legacy_us:.2f} µs")
+    print(f"buffered sink write:         {buffered_us:.2f} µs")
+    print(f"Files after rotation: {sizes}")
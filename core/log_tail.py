@@ -0,0 +1,114 @@
+"""
+Log Tail Module for Vision Assistant
+Follows the (rotating) stdout log on one thread and serves new text to any number of
+web clients from memory, by cursor, without re-reading the file per request
+"""
+
+import codecs
+import os
+import threading
+import time
+
+from core.config import LOG_FILE, WEB_TAIL_INTERVAL, WEB_HISTORY_CHARS
+
+
+class LogTail:
+    def __init__(self, path=LOG_FILE, poll_interval=WEB_TAIL_INTERVAL, history_chars=WEB_HISTORY_CHARS):
+        """
+        Args:
+            path: Log file written by core.log_sink
+            poll_interval: Seconds between checks for new data
+            history_chars: Recent text kept in memory for new or lagging clients
+        """
+        self.path = path
+        self.poll_interval = poll_interval
+        self.history_chars = history_chars
+        self._history = ""
+        self._start = 0   # Cursor of the first character in _history
+        self.cursor = 0   # Total characters seen; only ever grows, across rotations
+        self._cond = threading.Condition()
+        self._file = None
+        self._inode = None
+        self._decoder = None
+        self.running = True
+        self._thread = threading.Thread(target=self._tail_loop, daemon=True)
+        self._thread.start()
+
+    def _open(self, from_start):
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return False
+        stat = os.fstat(f.fileno())
+        if not from_start:
+            # Existing log on startup: only the tail is interesting
+            f.seek(max(0, stat.st_size - self.history_chars * 4))
+        self._file, self._inode = f, stat.st_ino
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        return True
+
+    def _read_new(self):
+        data = self._file.read()
+        return self._decoder.decode(data) if data else ""
+
+    def _rotated(self):
+        """True when the path now names a different file or the file was truncated"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        return stat.st_ino != self._inode or stat.st_size < self._file.tell()
+
+    def _append(self, text):
+        with self._cond:
+            self._history += text
+            self.cursor += len(text)
+            excess = len(self._history) - self.history_chars
+            if excess > 0:
+                self._history = self._history[excess:]
+                self._start += excess
+            self._cond.notify_all()
+
+    def _tail_loop(self):
+        first = True
+        while self.running:
+            if self._file is None:
+                if not self._open(from_start=not first):
+                    time.sleep(self.poll_interval)
+                    continue
+                first = False
+            text = self._read_new()
+            if self._rotated():
+                # Finish the rotated-away file, then follow the new one from its start
+                text += self._read_new()
+                self._file.close()
+                self._file = None
+                self._open(from_start=True)
+            if text:
+                self._append(text)
+            else:
+                time.sleep(self.poll_interval)
+
+    def since(self, cursor=None):
+        """
+        Text after a cursor
+        Returns:
+            Tuple of (text, new_cursor, reset); reset means the cursor was unknown or
+            too old and text is the whole retained history instead
+        """
+        with self._cond:
+            if cursor is None or cursor < self._start or cursor > self.cursor:
+                return self._history, self.cursor, True
+            return self._history[cursor - self._start:], self.cursor, False
+
+    def wait(self, cursor, timeout):
+        """since(cursor), blocking up to timeout seconds for new text"""
+        with self._cond:
+            self._cond.wait_for(lambda: self.cursor != cursor, timeout)
+        return self.since(cursor)
+
+    def stop(self):
+        self.running = False
+        self._thread.join(timeout=1.0)
+        if self._file is not None:
+            self._file.close()
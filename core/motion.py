@@ -0,0 +1,78 @@
+"""
+Motion Gate Module for Vision Assistant
+Cheap scene-change check that lets expensive stages reuse their last result
+"""
+
+import threading
+
+import cv2
+import numpy as np
+from core.config import MOTION_GATE_SIZE, MOTION_GATE_PIXEL_DELTA, MOTION_GATE_THRESHOLD
+
+
+def frame_signature(frame, size=MOTION_GATE_SIZE):
+    """Tiny grayscale thumbnail used for frame differencing"""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    return cv2.resize(gray, size, interpolation=cv2.INTER_AREA).astype(np.int16)
+
+
+class MotionGate:
+    def __init__(self, threshold=MOTION_GATE_THRESHOLD, pixel_delta=MOTION_GATE_PIXEL_DELTA,
+                 size=MOTION_GATE_SIZE):
+        """
+        Args:
+            threshold: Fraction of thumbnail pixels that must change to count as a new scene
+            pixel_delta: Intensity difference (0-255) for a thumbnail pixel to count as changed
+            size: Thumbnail (width, height)
+        """
+        self.threshold = threshold
+        self.pixel_delta = pixel_delta
+        self.size = size
+        self._reference = None
+        self._result = None
+        self._lock = threading.Lock()
+        self.checks = 0
+        self.skips = 0
+
+    def change_ratio(self, frame):
+        """Fraction of thumbnail pixels that differ from the last processed frame"""
+        signature = frame_signature(frame, self.size)
+        with self._lock:
+            reference = self._reference
+        if reference is None or reference.shape != signature.shape:
+            return 1.0, signature
+        changed = np.abs(signature - reference) > self.pixel_delta
+        return float(changed.mean()), signature
+
+    def run(self, frame, fn, *args, **kwargs):
+        """
+        Call fn(frame, *args, **kwargs) only if the scene changed since the last call
+        Returns:
+            fn's result, or the previous result when the scene is unchanged
+        """
+        ratio, signature = self.change_ratio(frame)
+        with self._lock:
+            self.checks += 1
+            if ratio <= self.threshold and self._result is not None:
+                self.skips += 1
+                return self._result
+
+        result = fn(frame, *args, **kwargs)
+        with self._lock:
+            # Only processed frames become the reference so slow drift still adds up
+            self._reference = signature
+            self._result = result
+        return result
+
+    def reset(self):
+        """Forget the last result so the next call always runs"""
+        with self._lock:
+            self._reference = None
+            self._result = None
+
+    @property
+    def skip_ratio(self):
+        return self.skips / self.checks if self.checks else 0.0
+
+    def stats(self):
+        return {"checks": self.checks, "skips": self.skips, "skip_ratio": self.skip_ratio}
@@ -1,35 +1,176 @@
 """
 Narration and Text-to-Speech (TTS) Module for Vision Assistant
+Speech runs on a dedicated worker with a prioritized, preemptible queue
 """
 
+import heapq
+import itertools
+import threading
+import time
+
 import pyttsx3
-from core.config import TTS_RATE, TTS_VOLUME
+from core.config import (
+    TTS_RATE, TTS_VOLUME, NARRATION_MAX_AGE, NARRATION_WAIT_TIMEOUT, SPEECH_CACHE_ENABLED,
+    SPEECH_CACHE_MAX_PENDING
+)
+from core.speech_cache import SpeechCache, AudioPlayer, COMMON_PHRASES, split_fragments
+from core.log_sink import log_event
+
+# Lower value = more important
+PRIORITY_URGENT = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
 
 class Narrator:
-    def __init__(self, rate=TTS_RATE, volume=TTS_VOLUME):
+    def __init__(self, rate=TTS_RATE, volume=TTS_VOLUME, max_age=NARRATION_MAX_AGE):
+        """
+        Args:
+            rate, volume: pyttsx3 voice settings
+            max_age: Seconds a queued non-urgent message may wait before it is dropped as stale
+        """
         print(f"Initializing Narrator: TTS rate={rate}, volume={volume}")
+        self.rate = rate
+        self.volume = volume
+        self.max_age = max_age
+        self.engine = None
+        self.running = True
+
+        self._queue = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._current = None
+        self._ready = threading.Event()
+        # Set by narrate(interrupt=True); the worker itself stops the engine at the next word
+        self._interrupt = threading.Event()
+
+        # Pre-rendered audio for frequent phrases; filled in while the worker is idle
+        self.cache = None
+        self.player = None
+        self._to_render = dict.fromkeys(COMMON_PHRASES)
+
+        # pyttsx3 engines must be driven from the thread that created them
+        self._thread = threading.Thread(target=self._worker, name="Narrator", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=10)
+
+        # Test TTS on init without holding up startup
+        if self.engine is not None:
+            self.narrate("Vision Assistant narrator ready", priority=PRIORITY_LOW)
+
+    def _init_engine(self):
+        engine = pyttsx3.init()
+        engine.setProperty('rate', self.rate)
+        engine.setProperty('volume', self.volume)
+        engine.connect('started-word', self._on_word)
+        return engine
+
+    def _on_word(self, name, location, length):
+        """pyttsx3 callback, run inside runAndWait on the worker thread"""
+        if self._interrupt.is_set():
+            self.engine.stop()
+
+    def _init_cache(self):
         try:
-            self.engine = pyttsx3.init()
-            self.engine.setProperty('rate', rate)
-            self.engine.setProperty('volume', volume)
-            
-            # Test TTS on init
-            print("Testing TTS engine...")
-            self.engine.say("Vision Assistant narrator ready")
-            self.engine.runAndWait()
+            self.player = AudioPlayer()
+            self.cache = SpeechCache(voice_key=f"{self.rate}:{self.volume}")
+            print("✅ Speech cache enabled")
+        except Exception as e:
+            print(f"⚠️ Speech cache disabled: {e}")
+            self.player = None
+            self.cache = None
+
+    def _worker(self):
+        try:
+            self.engine = self._init_engine()
             print("✅ TTS working")
         except Exception as e:
             print(f"⚠️ TTS initialization warning: {e}")
             self.engine = None
+        if self.engine is not None and SPEECH_CACHE_ENABLED:
+            self._init_cache()
+        self._ready.set()
+
+        while True:
+            with self._cond:
+                while not self._queue and self.running:
+                    if self.cache is not None and self._to_render:
+                        break
+                    self._cond.wait()
+                if not self._queue:
+                    if not self.running:
+                        break
+                    # Idle: pre-render one pending phrase, then check the queue again
+                    fragment = next(iter(self._to_render))
+                    del self._to_render[fragment]
+                    render = True
+                else:
+                    render = False
+                    priority, _, created, text, done = heapq.heappop(self._queue)
+                    if priority != PRIORITY_URGENT and time.time() - created > self.max_age:
+                        print(f"⏭️ Dropped stale narration: {text}")
+                        done.set()
+                        continue
+                    self._current = text
+                    self._interrupt.clear()
+                    if self.player is not None:
+                        self.player.interrupted.clear()
+
+            if render:
+                try:
+                    self.cache.render(self.engine, fragment)
+                except Exception as e:
+                    print(f"⚠️ Speech cache render failed: {e}")
+                continue
 
-    def narrate(self, text):
-        """Speaks out the provided text"""
+            # One failing utterance must not end the worker (and hang every waiting narrate)
+            try:
+                self._speak(text)
+            except Exception as e:
+                print(f"⚠️ Narration error: {e}")
+            finally:
+                with self._cond:
+                    self._current = None
+                done.set()
+
+    def _speak(self, text):
+        """Play one utterance, using cached audio for any pre-rendered fragment (worker thread only)"""
         print(f"🔊 Speaking: {text}")
-        
+
         if self.engine is None:
             print("⚠️ TTS engine not available, skipping speech")
             return
-        
+
+        if self.cache is None:
+            self._say(text)
+            return
+
+        live = []
+        for fragment in split_fragments(text):
+            entry = self.cache.get(fragment)
+            if entry is None:
+                live.append(fragment)
+                # Only fragments that keep recurring are worth rendering (the queue is bounded)
+                if self.cache.note_live(fragment) and len(self._to_render) < SPEECH_CACHE_MAX_PENDING:
+                    self._to_render[fragment] = None
+                continue
+            if live:
+                self._say(" ".join(live))
+                live = []
+            try:
+                if not self.player.play(entry):
+                    return  # Interrupted
+            except Exception as e:
+                # Audio device busy or format unsupported: speak this fragment live instead
+                print(f"⚠️ Cached audio playback failed: {e}")
+                self._say(fragment)
+        if live and not self.player.interrupted.is_set():
+            self._say(" ".join(live))
+
+    def _say(self, text):
+        """Synthesize and play text live through pyttsx3"""
+        if self._interrupt.is_set():
+            return
         try:
             self.engine.say(text)
             self.engine.runAndWait()
@@ -37,16 +178,80 @@ class Narrator:
             print(f"⚠️ TTS error: {e}")
             # Reinitialize engine if it crashed
             try:
-                self.engine = pyttsx3.init()
+                self.engine = self._init_engine()
                 self.engine.say(text)
                 self.engine.runAndWait()
-            except:
+            except Exception:
                 print("❌ TTS failed even after reinit")
 
+    def narrate(self, text, priority=PRIORITY_NORMAL, interrupt=False, wait=False,
+                timeout=NARRATION_WAIT_TIMEOUT):
+        """
+        Queue text to be spoken and return immediately
+        Args:
+            text: Text to speak
+            priority: PRIORITY_URGENT / PRIORITY_NORMAL / PRIORITY_LOW
+            interrupt: Cut off the utterance currently playing
+            wait: Block until this text has been spoken (or dropped)
+            timeout: Longest wait blocks, in seconds (None = no limit)
+        Returns:
+            False if the text was suppressed as a duplicate, True otherwise
+        """
+        done = threading.Event()
+        with self._cond:
+            if not interrupt and (text == self._current or any(item[3] == text for item in self._queue)):
+                return False
+            # A new message supersedes anything pending that is not more important
+            for item in self._queue:
+                if item[0] >= priority:
+                    item[4].set()
+            self._queue = [item for item in self._queue if item[0] < priority]
+            heapq.heapify(self._queue)
+            heapq.heappush(self._queue, (priority, next(self._seq), time.time(), text, done))
+            speaking = self._current is not None
+            self._cond.notify()
+
+        if interrupt and speaking and self.engine is not None:
+            # pyttsx3 may only be driven from the worker thread: signal, don't call stop() here
+            self._interrupt.set()
+            if self.player is not None:
+                self.player.interrupted.set()
+
+        log_event("narration", text=text, priority=priority, interrupt=interrupt)
+        if wait and not done.wait(timeout):
+            print(f"⚠️ Narration not finished after {timeout}s: {text}")
+        return True
+
+    def is_speaking(self):
+        with self._cond:
+            return self._current is not None or bool(self._queue)
+
+    def wait_until_done(self, timeout=None):
+        """Block until the queue is empty and nothing is playing"""
+        deadline = None if timeout is None else time.time() + timeout
+        while self.is_speaking():
+            if deadline is not None and time.time() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def stop(self):
+        """Finish queued speech and stop the worker"""
+        with self._cond:
+            self.running = False
+            self._cond.notify()
+        self._thread.join(timeout=5)
+        if self.player is not None:
+            self.player.close()
+
 # Test the module
 if __name__ == "__main__":
     print("Testing Narrator...")
     narrator = Narrator()
     test_text = "Vision Assistant is working! I see one laptop and two bottles."
     narrator.narrate(test_text)
-    print("✅ Narration test complete!")
\ No newline at end of file
+    narrator.narrate(test_text)  # Suppressed duplicate
+    narrator.narrate("Warning, obstacle ahead.", priority=PRIORITY_URGENT, interrupt=True)
+    narrator.wait_until_done()
+    narrator.stop()
+    print("✅ Narration test complete!")
@@ -7,80 +7,252 @@ import ssl
 import certifi
 ssl._create_default_https_context = lambda: ssl.create_default_context(cafile=certifi.where())
 
-import easyocr
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import cv2
 import numpy as np
+from core.config import (
+    OCR_PARALLEL_RECOGNITION, OCR_PREFILTER_ENABLED, OCR_REGION_PADDING,
+    OCR_MAX_REGIONS, OCR_FULL_FRAME_COVERAGE, OCR_ADAPTIVE_PREPROCESS,
+    OCR_POLICY_WARMUP, OCR_POLICY_EXPLORE_EVERY, OCR_POLICY_SMOOTHING
+)
+
+
+def find_text_regions(frame, padding=OCR_REGION_PADDING):
+    """
+    Fast classical text-candidate search based on gradient density
+    Characters produce dense, horizontally clustered gradients; we threshold the
+    morphological gradient, join neighbouring strokes into lines and keep boxes
+    that are mostly edge pixels.
+    Args:
+        frame: BGR image
+        padding: Margin (pixels) added around each candidate before merging
+    Returns:
+        List of merged [x1, y1, x2, y2] regions (empty if no text-like structure)
+    """
+    h, w = frame.shape[:2]
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, _GRADIENT_KERNEL)
+    _, binary = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    # Flat images make Otsu split pure noise; require real contrast
+    if cv2.mean(gradient)[0] < 2 and gradient.max() < 40:
+        return []
+    connected = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, _LINE_KERNEL)
+    contours, _ = cv2.findContours(connected, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    boxes = []
+    for contour in contours:
+        x, y, bw, bh = cv2.boundingRect(contour)
+        if bh < 8 or bw < 4 or bh > h * 0.5:
+            continue
+        # Text lines are wider than tall and densely filled once strokes are joined;
+        # narrower boxes are kept only at the size of one character ("1", "I", a floor number)
+        if bw < bh * 0.8 and (bh > h * 0.25 or bw < bh * 0.15):
+            continue
+        density = cv2.countNonZero(connected[y:y + bh, x:x + bw]) / float(bw * bh)
+        if density < 0.45:
+            continue
+        boxes.append([max(0, x - padding), max(0, y - padding),
+                      min(w, x + bw + padding), min(h, y + bh + padding)])
+    return _merge_boxes(boxes)
+
+
+def _merge_boxes(boxes):
+    """Repeatedly merge overlapping boxes until none overlap"""
+    merged = True
+    while merged:
+        merged = False
+        result = []
+        for box in boxes:
+            for other in result:
+                if box[0] <= other[2] and other[0] <= box[2] and box[1] <= other[3] and other[1] <= box[3]:
+                    other[0], other[1] = min(other[0], box[0]), min(other[1], box[1])
+                    other[2], other[3] = max(other[2], box[2]), max(other[3], box[3])
+                    merged = True
+                    break
+            else:
+                result.append(list(box))
+        boxes = result
+    return boxes
+
+
+_GRADIENT_KERNEL = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+_LINE_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (9, 1))
+
+
+class PreprocessPolicy:
+    """
+    Learns, per lighting condition, whether raw or preprocessed recognition
+    tends to win, so only the likely winner runs on most frames. Both paths
+    still run during warm-up and on periodic exploration frames.
+    """
+    RAW = "raw"
+    PROCESSED = "processed"
+    BOTH = "both"
+
+    def __init__(self, warmup=OCR_POLICY_WARMUP, explore_every=OCR_POLICY_EXPLORE_EVERY,
+                 smoothing=OCR_POLICY_SMOOTHING):
+        """
+        Args:
+            warmup: Comparisons needed in a lighting bucket before trusting it
+            explore_every: Run both paths on every Nth decision after warm-up
+            smoothing: Weight of the newest comparison in the moving win rate
+        """
+        self.warmup = warmup
+        self.explore_every = explore_every
+        self.smoothing = smoothing
+        self._stats = {}  # bucket -> [processed win rate, comparisons, decisions]
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def bucket(gray):
+        """Coarse lighting condition: brightness band and low/normal contrast"""
+        mean, std = cv2.meanStdDev(gray)
+        return int(mean[0][0] // 64), bool(std[0][0] < 30)
+
+    def choose(self, gray):
+        with self._lock:
+            stats = self._stats.setdefault(self.bucket(gray), [0.5, 0, 0])
+            stats[2] += 1
+            if stats[1] < self.warmup or stats[2] % self.explore_every == 0:
+                return self.BOTH
+            return self.PROCESSED if stats[0] > 0.5 else self.RAW
+
+    def record(self, gray, processed_wins, regions):
+        """Update the win rate after a both-paths comparison"""
+        if regions == 0:
+            return
+        with self._lock:
+            stats = self._stats.setdefault(self.bucket(gray), [0.5, 0, 0])
+            stats[0] += self.smoothing * (processed_wins / regions - stats[0])
+            stats[1] += 1
 
 
 class TextReader:
-    def __init__(self, languages=['en']):
+    def __init__(self, languages=['en'], adaptive=OCR_ADAPTIVE_PREPROCESS):
         """
         Initialize EasyOCR reader
         Args:
             languages: List of language codes (e.g., ['en'] for English, ['en', 'hi'] for English+Hindi)
+            adaptive: Learn whether raw or preprocessed recognition wins and mostly run only that one
         """
         print(f"Initializing OCR reader for languages: {languages}")
+        import easyocr  # Heavy (pulls in torch); imported on construction
         self.reader = easyocr.Reader(languages, gpu=False)  # Set gpu=True if you have CUDA
+        # Raw and preprocessed recognition run side by side (torch releases the GIL)
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ocr") if OCR_PARALLEL_RECOGNITION else None
+        # Preprocessing objects are built once instead of on every frame
+        self._clahe = cv2.createCLAHE(clipLimit=1.5, tileGridSize=(8, 8))
+        self._sharpen_kernel = np.array([[-1, -1, -1],
+                                         [-1,  9, -1],
+                                         [-1, -1, -1]], dtype=np.float32)
+        self.policy = PreprocessPolicy() if adaptive else None
         print("✅ OCR reader initialized")
     
     def preprocess_image(self, frame):
         """
         Gentle preprocessing that doesn't distort text
         Args:
-            frame: Input image
+            frame: Input image (BGR or grayscale)
         Returns:
-            Preprocessed image
+            Preprocessed grayscale image
         """
         # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
         
-        # Apply very gentle denoising (less aggressive than before)
-        # Using fastNlMeansDenoising instead of bilateral for better text preservation
-        denoised = cv2.fastNlMeansDenoising(gray, h=10)
+        # 3x3 median removes sensor speckle while keeping stroke edges,
+        # at a small fraction of fastNlMeansDenoising's cost
+        denoised = cv2.medianBlur(gray, 3)
         
         # Gentle contrast enhancement using CLAHE with lower clip limit
-        clahe = cv2.createCLAHE(clipLimit=1.5, tileGridSize=(8, 8))
-        enhanced = clahe.apply(denoised)
+        enhanced = self._clahe.apply(denoised)
         
         # Sharpen the image to make text edges crisp
-        kernel_sharpen = np.array([[-1,-1,-1],
-                                   [-1, 9,-1],
-                                   [-1,-1,-1]])
-        sharpened = cv2.filter2D(enhanced, -1, kernel_sharpen)
+        return cv2.filter2D(enhanced, -1, self._sharpen_kernel)
+    
+    def _detect_and_recognize(self, frame, preprocess):
+        """
+        Run text detection once, then recognition on the raw and/or preprocessed
+        image for the same regions. When both run, the better read per region wins
+        and the outcome trains the adaptive policy.
+        Returns:
+            EasyOCR-style list of (bbox, text, confidence)
+        """
+        horizontal_list, free_list = self.reader.detect(frame)
+        horizontal_list, free_list = horizontal_list[0], free_list[0]
+        if not horizontal_list and not free_list:
+            return []
+        
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if not preprocess:
+            return self.reader.recognize(gray, horizontal_list, free_list)
+        
+        strategy = self.policy.choose(gray) if self.policy is not None else PreprocessPolicy.BOTH
+        if strategy == PreprocessPolicy.RAW:
+            return self.reader.recognize(gray, horizontal_list, free_list)
+        processed = self.preprocess_image(gray)
+        if strategy == PreprocessPolicy.PROCESSED:
+            return self.reader.recognize(processed, horizontal_list, free_list)
+        
+        if self._pool is not None:
+            raw_future = self._pool.submit(self.reader.recognize, gray, horizontal_list, free_list)
+            results_processed = self.reader.recognize(processed, horizontal_list, free_list)
+            results_raw = raw_future.result()
+        else:
+            results_raw = self.reader.recognize(gray, horizontal_list, free_list)
+            results_processed = self.reader.recognize(processed, horizontal_list, free_list)
         
-        return sharpened
+        # Both passes see identical boxes; pick the more confident read per region
+        processed_by_box = {self._box_key(r[0]): r for r in results_processed}
+        results = []
+        processed_wins = 0
+        for raw in results_raw:
+            candidate = processed_by_box.get(self._box_key(raw[0]))
+            if candidate is not None and candidate[2] > raw[2]:
+                results.append(candidate)
+                processed_wins += 1
+            else:
+                results.append(raw)
+        if self.policy is not None:
+            self.policy.record(gray, processed_wins, len(results))
+        print(f"  [OCR Debug] {len(results)} regions, processed won {processed_wins}")
+        return results
     
-    def read_text(self, frame, confidence_threshold=0.3, preprocess=True):
+    @staticmethod
+    def _box_key(bbox):
+        return tuple(int(v) for point in bbox for v in point)
+    
+    def read_text(self, frame, confidence_threshold=0.3, preprocess=True, prefilter=OCR_PREFILTER_ENABLED):
         """
         Detect and extract text from frame
         Args:
             frame: Image frame
             confidence_threshold: Minimum confidence (lowered for more detections)
-            preprocess: Whether to apply image preprocessing
+            preprocess: Also recognize a preprocessed copy and keep the better read per region
+            prefilter: Only send candidate text regions (see find_text_regions) to EasyOCR
         Returns:
             Tuple of (detected_texts list, annotated_frame)
         """
         # Store original frame for annotation
         original_frame = frame.copy()
         
-        # Try BOTH preprocessing and raw - use results from whichever gives more confident results
-        results_raw = self.reader.readtext(frame)
-        
-        if preprocess:
-            processed_frame = self.preprocess_image(frame)
-            # Convert back to BGR for EasyOCR
-            processed_frame = cv2.cvtColor(processed_frame, cv2.COLOR_GRAY2BGR)
-            results_processed = self.reader.readtext(processed_frame)
-            
-            # Compare average confidence - use better one
-            avg_conf_raw = sum(r[2] for r in results_raw) / len(results_raw) if results_raw else 0
-            avg_conf_processed = sum(r[2] for r in results_processed) / len(results_processed) if results_processed else 0
-            
-            # Use whichever has higher average confidence
-            results = results_processed if avg_conf_processed > avg_conf_raw else results_raw
-            print(f"  [OCR Debug] Raw conf: {avg_conf_raw:.2f}, Processed conf: {avg_conf_processed:.2f}")
+        if prefilter:
+            regions = find_text_regions(frame)
+            coverage = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in regions)
+            h, w = frame.shape[:2]
+            # No candidates: the gradient heuristic can miss sparse or large single characters,
+            # so an explicit read still gets a full-frame pass before answering "no text"
+            if not regions or len(regions) > OCR_MAX_REGIONS or coverage > OCR_FULL_FRAME_COVERAGE * w * h:
+                regions = [[0, 0, w, h]]  # Crops would not save anything
         else:
-            results = results_raw
+            regions = [[0, 0, frame.shape[1], frame.shape[0]]]
+        
+        results = []
+        for x1, y1, x2, y2 in regions:
+            crop_results = self._detect_and_recognize(frame[y1:y2, x1:x2], preprocess)
+            for bbox, text, conf in crop_results:
+                results.append(([[px + x1, py + y1] for px, py in bbox], text, conf))
         
         detected_texts = []
         for (bbox, text, conf) in results:
@@ -113,6 +285,21 @@ class TextReader:
         
         return detected_texts, original_frame
     
+    def read_region(self, crop, confidence_threshold=0.3, preprocess=False):
+        """
+        Recognize text inside an already-located region (no prefilter, no annotation)
+        Args:
+            crop: BGR image of the region
+        Returns:
+            List of cleaned text strings, in reading order
+        """
+        texts = []
+        for _, text, conf in self._detect_and_recognize(crop, preprocess):
+            text = text.strip()
+            if conf >= confidence_threshold and text:
+                texts.append(text)
+        return texts
+    
     def format_text_output(self, texts):
         """
         Format detected texts into natural speech output
@@ -0,0 +1,114 @@
+"""
+Reading Mode Module for Vision Assistant
+Continuous OCR that tracks text regions across frames and only reads what is new
+"""
+
+import time
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+from core.config import (
+    READING_IOU_THRESHOLD, READING_CHANGE_THRESHOLD,
+    READING_REGION_TIMEOUT, READING_MEMORY_SIZE
+)
+from core.ocr import find_text_regions
+from core.tracking import iou_matrix
+
+
+def _region_signature(crop):
+    """Small normalized thumbnail used to tell whether a region's content changed"""
+    gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(gray, (32, 8), interpolation=cv2.INTER_AREA).astype(np.int16)
+
+
+def _normalize(text):
+    return " ".join(text.lower().split())
+
+
+class TextRegion:
+    def __init__(self, box, signature, texts):
+        self.box = box
+        self.signature = signature
+        self.texts = texts
+        self.last_seen = time.time()
+
+
+class ReadingSession:
+    def __init__(self, text_reader, iou_threshold=READING_IOU_THRESHOLD,
+                 change_threshold=READING_CHANGE_THRESHOLD,
+                 region_timeout=READING_REGION_TIMEOUT, memory_size=READING_MEMORY_SIZE):
+        """
+        Args:
+            text_reader: TextReader used to recognize new or changed regions
+            iou_threshold: Minimum overlap for a candidate to continue a known region
+            change_threshold: Mean thumbnail difference (0-255) that counts as new content
+            region_timeout: Seconds a region may go unseen before it is forgotten
+            memory_size: Number of recently spoken texts remembered for de-duplication
+        """
+        self.text_reader = text_reader
+        self.iou_threshold = iou_threshold
+        self.change_threshold = change_threshold
+        self.region_timeout = region_timeout
+        self.memory_size = memory_size
+        self.regions = []
+        self._spoken = OrderedDict()
+        self.frames = 0
+        self.recognitions = 0
+
+    def update(self, frame):
+        """
+        Process one frame
+        Returns:
+            List of text strings that have not been read out before
+        """
+        self.frames += 1
+        now = time.time()
+        candidates = find_text_regions(frame)
+        self.regions = [r for r in self.regions if now - r.last_seen <= self.region_timeout]
+
+        ious = iou_matrix(candidates, [r.box for r in self.regions]) \
+            if candidates and self.regions else None
+
+        new_texts = []
+        for ci, box in enumerate(candidates):
+            x1, y1, x2, y2 = box
+            crop = frame[y1:y2, x1:x2]
+            signature = _region_signature(crop)
+
+            region = None
+            if ious is not None:
+                ri = int(np.argmax(ious[ci]))
+                if ious[ci, ri] >= self.iou_threshold:
+                    region = self.regions[ri]
+
+            if region is not None:
+                region.box = box
+                region.last_seen = now
+                if np.abs(signature - region.signature).mean() <= self.change_threshold:
+                    continue  # Same text as before, already handled
+                region.signature = signature
+            else:
+                region = TextRegion(box, signature, [])
+                self.regions.append(region)
+
+            region.texts = self.text_reader.read_region(crop)
+            self.recognitions += 1
+            new_texts.extend(text for text in region.texts if self._remember(text))
+
+        return new_texts
+
+    def _remember(self, text):
+        """Record text as spoken; False if it was already read recently"""
+        key = _normalize(text)
+        if key in self._spoken:
+            self._spoken.move_to_end(key)
+            return False
+        self._spoken[key] = None
+        while len(self._spoken) > self.memory_size:
+            self._spoken.popitem(last=False)
+        return True
+
+    def reset(self):
+        self.regions = []
+        self._spoken.clear()
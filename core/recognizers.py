@@ -0,0 +1,183 @@
+"""
+Speech Recognizer Backends for Vision Assistant
+Pluggable backends behind one streaming interface: start() / feed(chunk) / finish()
+"""
+
+import json
+
+from core.config import (
+    DESCRIBE_COMMANDS, REPEAT_COMMANDS, EXIT_COMMANDS, OBJECT_QUERY_KEYWORDS,
+    QUERYABLE_OBJECTS, OBJECT_SYNONYMS, READ_TEXT_COMMANDS, READING_MODE_COMMANDS,
+    EMOTION_COMMANDS, NEGATION_WORDS, FILLER_WORDS,
+    VOICE_SAMPLE_RATE, VOSK_MODEL_PATH, VOICE_EARLY_FIRE_CHUNKS
+)
+from core.intents import (
+    IntentMatcher, INTENT_FIND_OBJECT, INTENT_EXIT, INTENT_READING, default_matcher, tokenize
+)
+
+# Intents whose meaning depends on words that may still follow ("stop reading", "reading off")
+_NO_EARLY_FIRE = {INTENT_EXIT, INTENT_READING}
+
+
+def build_vocabulary(extra_objects=()):
+    """
+    Every phrase the app can act on, for grammar-restricted offline recognition
+    Args:
+        extra_objects: Additional object names (e.g. the detector's class names)
+    """
+    phrases = (DESCRIBE_COMMANDS + REPEAT_COMMANDS + EXIT_COMMANDS + OBJECT_QUERY_KEYWORDS
+               + QUERYABLE_OBJECTS + list(OBJECT_SYNONYMS) + READ_TEXT_COMMANDS
+               + READING_MODE_COMMANDS + EMOTION_COMMANDS + NEGATION_WORDS + FILLER_WORDS
+               + list(extra_objects))
+    return sorted(set(p.lower() for p in phrases))
+
+
+def phrase_prefixes(vocabulary):
+    """Proper word prefixes of the multi-word phrases ("stop" for "stop sign")"""
+    prefixes = set()
+    for phrase in vocabulary:
+        words = tuple(tokenize(phrase))
+        prefixes.update(words[:i] for i in range(1, len(words)))
+    return prefixes
+
+
+def is_complete_command(text, matcher=None, prefixes=frozenset()):
+    """
+    True once text holds something the app can act on without hearing more
+    Args:
+        matcher: IntentMatcher to resolve text with (default_matcher() if None)
+        prefixes: phrase_prefixes() of the vocabulary; text ending in one may still grow
+    """
+    if not text:
+        return False
+    words = tuple(tokenize(text))
+    if any(words[-i:] in prefixes for i in range(1, len(words) + 1)):
+        return False
+    intent = (matcher or default_matcher()).match(text)
+    if intent.name is None or intent.name in _NO_EARLY_FIRE:
+        return False
+    # A guessed (out-of-vocabulary) object may still be mid-word
+    return not (intent.name == INTENT_FIND_OBJECT and not intent.slots["known"])
+
+
+class GoogleRecognizer:
+    """Online recognizer (SpeechRecognition's recognize_google) on a buffered utterance"""
+
+    name = "google"
+
+    def __init__(self, sample_rate=VOICE_SAMPLE_RATE):
+        import speech_recognition as sr
+        self._sr = sr
+        self._recognizer = sr.Recognizer()
+        self.sample_rate = sample_rate
+        self._audio = []
+
+    def set_vocabulary(self, extra_objects):
+        pass  # Open vocabulary
+
+    def start(self):
+        self._audio = []
+
+    def feed(self, chunk):
+        self._audio.append(chunk)
+        return None  # Needs the whole utterance
+
+    def finish(self):
+        audio = self._sr.AudioData(b"".join(self._audio), self.sample_rate, 2)
+        self._audio = []
+        try:
+            return self._recognizer.recognize_google(audio).lower()
+        except self._sr.UnknownValueError:
+            return None
+        except self._sr.RequestError as e:
+            print(f"❌ Network error: {e}")
+            return None
+
+
+class VoskCommandRecognizer:
+    """
+    Offline recognizer restricted to the app's command vocabulary
+    Partial results are checked while audio streams in, so a command can fire
+    as soon as it is recognized instead of waiting for the end of the phrase
+    (never while the partial could still grow into a different command).
+    """
+
+    name = "vosk"
+
+    def __init__(self, model_path=VOSK_MODEL_PATH, sample_rate=VOICE_SAMPLE_RATE,
+                 early_fire_chunks=VOICE_EARLY_FIRE_CHUNKS):
+        """
+        Args:
+            model_path: Directory of a Vosk model (e.g. vosk-model-small-en-us)
+            early_fire_chunks: Chunks a complete partial command must stay unchanged before firing
+        """
+        from vosk import Model, SetLogLevel
+        SetLogLevel(-1)
+        self._model = Model(model_path)
+        self.sample_rate = sample_rate
+        self.early_fire_chunks = early_fire_chunks
+        self._last_partial = ""
+        self._stable = 0
+        self.set_vocabulary(())
+
+    def set_vocabulary(self, extra_objects):
+        """Rebuild the grammar with extra object names (e.g. the detector's class names)"""
+        from vosk import KaldiRecognizer
+        vocabulary = build_vocabulary(extra_objects)
+        self._recognizer = KaldiRecognizer(self._model, self.sample_rate, json.dumps(vocabulary + ["[unk]"]))
+        self._matcher = IntentMatcher(extra_objects) if extra_objects else default_matcher()
+        self._prefixes = phrase_prefixes(vocabulary)
+
+    @staticmethod
+    def _clean(text):
+        return " ".join(w for w in text.split() if w != "[unk]")
+
+    def start(self):
+        self._recognizer.Reset()
+        self._last_partial = ""
+        self._stable = 0
+
+    def feed(self, chunk):
+        """Returns the command text as soon as it is recognized, else None"""
+        if self._recognizer.AcceptWaveform(chunk):
+            text = self._clean(json.loads(self._recognizer.Result()).get("text", ""))
+            return text or None
+        partial = self._clean(json.loads(self._recognizer.PartialResult()).get("partial", ""))
+        self._stable = self._stable + 1 if partial == self._last_partial else 0
+        self._last_partial = partial
+        if self._stable >= self.early_fire_chunks and is_complete_command(partial, self._matcher, self._prefixes):
+            return partial
+        return None
+
+    def finish(self):
+        text = self._clean(json.loads(self._recognizer.FinalResult()).get("text", ""))
+        return text or None
+
+
+def make_recognizer(backend):
+    """Build a recognizer backend by name ('vosk' or 'google')"""
+    if backend == "vosk":
+        return VoskCommandRecognizer()
+    if backend == "google":
+        return GoogleRecognizer()
+    raise ValueError(f"Unknown voice backend: {backend}")
+
+
+# Transcribe recorded WAV files without a microphone
+if __name__ == "__main__":
+    import sys
+    from core.config import VOICE_BACKEND
+    from core.voice_control import VoiceController
+    from core.audio_input import WavFileSource
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m core.recognizers command1.wav [command2.wav ...]")
+        sys.exit(1)
+    for path in sys.argv[1:]:
+        vc = VoiceController(backend=VOICE_BACKEND, audio_source=WavFileSource(path))
+        commands = []
+        while not vc.exhausted:
+            command = vc.listen()
+            if command:
+                commands.append(command)
+        print(f"{path}: {commands}")
@@ -0,0 +1,129 @@
+"""
+Result Cache Module for Vision Assistant
+Perceptual-fingerprint cache so repeated requests on the same view return instantly
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+from core.config import (
+    RESULT_CACHE_SIZE, RESULT_CACHE_TTL, RESULT_CACHE_HASH_SIZE, RESULT_CACHE_MAX_DISTANCE
+)
+
+
+def _hashable(value):
+    """Params as a cache-key part: lists / arrays (e.g. boxes) become nested tuples"""
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _hashable(v)) for k, v in value.items()))
+    return value
+
+
+def frame_fingerprint(frame, hash_size=RESULT_CACHE_HASH_SIZE):
+    """
+    Difference hash (dHash) of a frame
+    Each bit records whether a thumbnail pixel is brighter than its right neighbour,
+    so the hash ignores exposure drift but changes when the layout changes.
+    Returns:
+        int with hash_size * hash_size bits
+    """
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    thumb = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (thumb[:, 1:] > thumb[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count("1")
+
+
+class ResultCache:
+    def __init__(self, max_entries=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL,
+                 max_distance=RESULT_CACHE_MAX_DISTANCE):
+        """
+        Args:
+            max_entries: LRU capacity across all stages
+            ttl: Seconds an entry stays valid
+            max_distance: Fingerprint bits that may differ for a near-identical hit
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_distance = max_distance
+        self._entries = OrderedDict()  # (stage, params, fingerprint) -> (timestamp, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _params_key(params):
+        return tuple(sorted((name, _hashable(value)) for name, value in params.items()))
+
+    def get(self, stage, fingerprint, params_key=()):
+        """Cached value for a stage/params on a matching frame, or None"""
+        now = time.time()
+        with self._lock:
+            key = (stage, params_key, fingerprint)
+            entry = self._entries.get(key)
+            if entry is None and self.max_distance > 0:
+                # Near-identical frames: nearest fingerprint within max_distance
+                best = None
+                for (s, p, fp), candidate in self._entries.items():
+                    if s != stage or p != params_key:
+                        continue
+                    distance = hamming_distance(fp, fingerprint)
+                    if distance <= self.max_distance and (best is None or distance < best[0]):
+                        best = (distance, (s, p, fp), candidate)
+                if best is not None:
+                    _, key, entry = best
+            if entry is not None and now - entry[0] > self.ttl:
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, stage, fingerprint, value, params_key=()):
+        with self._lock:
+            self._entries[(stage, params_key, fingerprint)] = (time.time(), value)
+            self._entries.move_to_end((stage, params_key, fingerprint))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, stage, frame, fn, **params):
+        """
+        Return fn(frame, **params), served from the cache when the same stage with
+        the same params recently ran on a (near-)identical frame
+        """
+        fingerprint = frame_fingerprint(frame)
+        params_key = self._params_key(params)
+        value = self.get(stage, fingerprint, params_key)
+        if value is None:
+            value = fn(frame, **params)
+            self.put(stage, fingerprint, value, params_key)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
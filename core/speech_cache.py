@@ -0,0 +1,206 @@
+"""
+Speech Audio Cache Module for Vision Assistant
+Pre-rendered TTS audio for frequent phrases, kept in a size-bounded LRU (memory + disk)
+"""
+
+import hashlib
+import io
+import os
+import re
+import threading
+import wave
+from collections import OrderedDict
+
+from core.config import (
+    SPEECH_CACHE_DIR, SPEECH_CACHE_MAX_BYTES, SPEECH_CACHE_MAX_FILES, SPEECH_CACHE_MAX_TEXT,
+    SPEECH_CACHE_MIN_USES, SPEECH_CACHE_TRACKED
+)
+
+try:
+    import pyaudio
+except ImportError:
+    pyaudio = None
+
+# Phrases the app says verbatim often enough to render at startup
+COMMON_PHRASES = [
+    "Camera error.",
+    "No text detected.",
+    "I don't see any objects nearby.",
+    "No previous description.",
+    "Goodbye!",
+]
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_fragments(text):
+    """Split an utterance into sentence fragments that can be cached independently"""
+    return [part for part in _SENTENCE_SPLIT.split(text.strip()) if part]
+
+
+class SpeechCache:
+    def __init__(self, voice_key, cache_dir=SPEECH_CACHE_DIR, max_bytes=SPEECH_CACHE_MAX_BYTES,
+                 max_files=SPEECH_CACHE_MAX_FILES):
+        """
+        Args:
+            voice_key: String identifying the voice settings (rate/volume) audio was rendered with
+            cache_dir: Directory for rendered WAV files
+            max_bytes: Memory budget for decoded audio
+            max_files: Maximum WAV files kept on disk
+        """
+        self.voice_key = voice_key
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self._memory = OrderedDict()  # key -> (params, frames)
+        self._memory_bytes = 0
+        self._uses = OrderedDict()    # uncached text -> times spoken live (LRU-bounded)
+        self._undecodable = set()     # Paths the TTS driver renders in a format wave cannot read
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path_for(self, text):
+        key = hashlib.sha1(f"{self.voice_key}|{text}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.wav")
+
+    def cacheable(self, text):
+        return 0 < len(text) <= SPEECH_CACHE_MAX_TEXT
+
+    def note_live(self, text, min_uses=SPEECH_CACHE_MIN_USES):
+        """
+        Count one live (uncached) use of text
+        Returns:
+            True once text is spoken often enough to be worth rendering
+        """
+        if not self.cacheable(text) or self.path_for(text) in self._undecodable:
+            return False
+        with self._lock:
+            uses = self._uses.pop(text, 0) + 1
+            if uses >= min_uses:
+                return True
+            self._uses[text] = uses
+            while len(self._uses) > SPEECH_CACHE_TRACKED:
+                self._uses.popitem(last=False)
+        return False
+
+    def get(self, text):
+        """
+        Decoded audio for text, or None when it has not been rendered yet
+        Returns:
+            Tuple of (wave params, PCM frames) or None
+        """
+        path = self.path_for(text)
+        with self._lock:
+            entry = self._memory.get(path)
+            if entry is not None:
+                self._memory.move_to_end(path)
+                self.hits += 1
+                return entry
+
+        if not os.path.exists(path):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            with wave.open(io.BytesIO(data)) as wav:
+                entry = (wav.getparams(), wav.readframes(wav.getnframes()))
+        except (OSError, EOFError, wave.Error):
+            # Some TTS drivers write formats wave cannot read (e.g. AIFF on macOS);
+            # remember it so the text is not rendered again on every use
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            with self._lock:
+                self._undecodable.add(path)
+                self.misses += 1
+            return None
+
+        os.utime(path)  # Touch so disk eviction is least-recently-used
+        self._remember(path, entry)
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def _remember(self, path, entry):
+        size = len(entry[1])
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if path in self._memory:
+                return
+            self._memory[path] = entry
+            self._memory_bytes += size
+            while self._memory_bytes > self.max_bytes:
+                _, (_, frames) = self._memory.popitem(last=False)
+                self._memory_bytes -= len(frames)
+
+    def render(self, engine, text):
+        """Synthesize text to the cache with a pyttsx3 engine (call from the engine's thread)"""
+        path = self.path_for(text)
+        if os.path.exists(path):
+            return True
+        if path in self._undecodable:
+            return False
+        tmp_path = path + ".tmp.wav"
+        try:
+            engine.save_to_file(text, tmp_path)
+            engine.runAndWait()
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"⚠️ Could not pre-render '{text}': {e}")
+            return False
+        self._evict_disk()
+        return True
+
+    def _evict_disk(self):
+        files = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                 if name.endswith(".wav") and not name.endswith(".tmp.wav")]
+        if len(files) <= self.max_files:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_files]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class AudioPlayer:
+    """Plays decoded PCM audio through PyAudio and can be interrupted between chunks"""
+
+    CHUNK_FRAMES = 1024
+
+    def __init__(self):
+        if pyaudio is None:
+            raise ImportError("pyaudio is required to play cached speech")
+        self._audio = pyaudio.PyAudio()
+        self.interrupted = threading.Event()
+
+    def play(self, entry):
+        """Play (params, frames); returns False if interrupted"""
+        params, frames = entry
+        stream = self._audio.open(
+            format=self._audio.get_format_from_width(params.sampwidth),
+            channels=params.nchannels,
+            rate=params.framerate,
+            output=True
+        )
+        step = self.CHUNK_FRAMES * params.sampwidth * params.nchannels
+        try:
+            for start in range(0, len(frames), step):
+                if self.interrupted.is_set():
+                    return False
+                stream.write(frames[start:start + step])
+        finally:
+            stream.stop_stream()
+            stream.close()
+        return True
+
+    def close(self):
+        self._audio.terminate()
@@ -0,0 +1,106 @@
+"""
+Startup Module for Vision Assistant
+Concurrent subsystem initialization, lazy loading and per-subsystem timings
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.log_sink import log_event
+
+
+class StartupTimer:
+    """Collects how long each subsystem took to initialize"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.timings = {}
+        self._lock = threading.Lock()
+
+    def run(self, name, factory):
+        """Call factory(), record its duration under name and return its result"""
+        t0 = time.perf_counter()
+        try:
+            return factory()
+        finally:
+            elapsed = time.perf_counter() - t0
+            with self._lock:
+                self.timings[name] = elapsed
+            print(f"⏱️ {name} ready in {elapsed:.2f}s")
+            log_event("timing", stage=f"startup:{name}", ms=round(elapsed * 1000, 1))
+
+    def report(self):
+        total = time.perf_counter() - self.start
+        print("\nStartup timings:")
+        with self._lock:
+            for name, elapsed in sorted(self.timings.items(), key=lambda item: -item[1]):
+                print(f"  {name:<16} {elapsed:6.2f}s")
+        print(f"  {'time to ready':<16} {total:6.2f}s\n")
+
+
+def init_parallel(factories, timer, max_workers=None):
+    """
+    Initialize independent subsystems concurrently
+    Args:
+        factories: Dict of name -> zero-argument constructor
+        timer: StartupTimer recording per-subsystem durations
+    Returns:
+        Dict of name -> constructed object (the first failure is re-raised)
+    """
+    with ThreadPoolExecutor(max_workers=max_workers or len(factories), thread_name_prefix="init") as pool:
+        futures = {name: pool.submit(timer.run, name, factory) for name, factory in factories.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+class LazySubsystem:
+    """
+    Proxy that constructs a subsystem on first use
+    Attribute access is forwarded to the real object once it exists.
+    """
+
+    def __init__(self, name, factory, timer=None):
+        self._name = name
+        self._factory = factory
+        self._timer = timer
+        self._instance = None
+        self._error = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _load(self):
+        with self._lock:
+            if self._instance is None and self._error is None:
+                print(f"Loading {self._name}...")
+                try:
+                    if self._timer is not None:
+                        self._instance = self._timer.run(self._name, self._factory)
+                    else:
+                        self._instance = self._factory()
+                except Exception as e:
+                    self._error = e
+            if self._error is not None:
+                raise self._error
+            return self._instance
+
+    def prefetch(self):
+        """Start loading in the background so first use does not wait the full load time"""
+        if self._thread is None:
+            def load_quietly():
+                try:
+                    self._load()
+                except Exception as e:
+                    print(f"⚠️ {self._name} prefetch failed: {e}")
+            self._thread = threading.Thread(target=load_quietly, name=f"prefetch-{self._name}", daemon=True)
+            self._thread.start()
+        return self
+
+    @property
+    def loaded(self):
+        return self._instance is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __bool__(self):
+        return True
@@ -0,0 +1,225 @@
+"""
+Multi-Object Tracking Module for Vision Assistant
+IoU matching + constant-velocity filter with optical-flow propagation between keyframes
+"""
+
+import itertools
+
+import cv2
+import numpy as np
+from core.config import (
+    TRACKER_KEYFRAME_INTERVAL, TRACKER_IOU_THRESHOLD,
+    TRACKER_MAX_MISSES, TRACKER_FLOW_SCALE
+)
+from core.detections import Detections, SOURCE_DOOR
+from core.utils import draw_bounding_box
+
+
+def iou_matrix(boxes_a, boxes_b):
+    """Pairwise IoU between (N, 4) and (M, 4) box arrays"""
+    a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 1, 4)
+    b = np.asarray(boxes_b, dtype=np.float32).reshape(1, -1, 4)
+    ix1 = np.maximum(a[..., 0], b[..., 0])
+    iy1 = np.maximum(a[..., 1], b[..., 1])
+    ix2 = np.minimum(a[..., 2], b[..., 2])
+    iy2 = np.minimum(a[..., 3], b[..., 3])
+    inter = np.clip(ix2 - ix1, 0, None) * np.clip(iy2 - iy1, 0, None)
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    union = area_a + area_b - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-6), 0.0)
+
+
+class Track:
+    # Alpha-beta gains: a steady-state Kalman filter for a constant-velocity box
+    ALPHA = 0.6
+    BETA = 0.2
+
+    def __init__(self, track_id, box, class_id, source, score):
+        self.track_id = track_id
+        self.box = np.asarray(box, dtype=np.float32)
+        self.velocity = np.zeros(4, dtype=np.float32)
+        self.class_id = class_id
+        self.source = source
+        self.score = score
+        self.hits = 1
+        self.misses = 0
+
+    def predict(self):
+        """Advance the box one frame along its velocity"""
+        self.box = self.box + self.velocity
+        return self.box
+
+    def correct(self, measured_box):
+        """Blend a measured box into the prediction"""
+        residual = np.asarray(measured_box, dtype=np.float32) - self.box
+        self.box = self.box + self.ALPHA * residual
+        self.velocity = self.velocity + self.BETA * residual
+
+
+class ObjectTracker:
+    def __init__(self, iou_threshold=TRACKER_IOU_THRESHOLD, max_misses=TRACKER_MAX_MISSES,
+                 flow_scale=TRACKER_FLOW_SCALE):
+        """
+        Args:
+            iou_threshold: Minimum IoU to associate a detection with a track
+            max_misses: Keyframes a track may go unmatched before it is dropped
+            flow_scale: Downscale factor for optical flow between keyframes
+        """
+        self.iou_threshold = iou_threshold
+        self.max_misses = max_misses
+        self.flow_scale = flow_scale
+        self.tracks = []
+        self.names = {}
+        self.lost = False
+        self._ids = itertools.count(1)
+        self._prev_gray = None
+
+    def _gray(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        s = self.flow_scale
+        if s != 1.0:
+            gray = cv2.resize(gray, None, fx=s, fy=s, interpolation=cv2.INTER_AREA)
+        return gray
+
+    def update(self, frame, detections):
+        """
+        Associate fresh detections with existing tracks (keyframe step)
+        Args:
+            frame: Frame the detections were computed on
+            detections: Detections from the full detector
+        """
+        self.names = detections.names
+        self._prev_gray = self._gray(frame)
+        for track in self.tracks:
+            track.predict()
+
+        unmatched = set(range(len(detections)))
+        if self.tracks and len(detections):
+            ious = iou_matrix([t.box for t in self.tracks], detections.boxes)
+            # Only the same class (and source) may match
+            same_class = (np.array([t.class_id for t in self.tracks])[:, None] == detections.class_ids[None, :]) & \
+                         (np.array([t.source for t in self.tracks])[:, None] == detections.sources[None, :])
+            ious = np.where(same_class, ious, 0.0)
+            # Greedy assignment, best IoU first
+            for flat in np.argsort(ious, axis=None)[::-1]:
+                ti, di = np.unravel_index(flat, ious.shape)
+                if ious[ti, di] < self.iou_threshold:
+                    break
+                track = self.tracks[ti]
+                if track.misses < 0 or di not in unmatched:
+                    continue
+                track.correct(detections.boxes[di])
+                track.score = float(detections.scores[di])
+                track.hits += 1
+                track.misses = -1  # Marks matched for this round
+                unmatched.discard(di)
+
+        for track in self.tracks:
+            track.misses = 0 if track.misses < 0 else track.misses + 1
+        self.tracks = [t for t in self.tracks if t.misses <= self.max_misses]
+
+        for di in sorted(unmatched):
+            self.tracks.append(Track(next(self._ids), detections.boxes[di],
+                                     int(detections.class_ids[di]), int(detections.sources[di]),
+                                     float(detections.scores[di])))
+        self.lost = False
+
+    def propagate(self, frame):
+        """
+        Move tracks to the new frame without running the detector
+        Uses sparse optical flow inside each box as the measurement and falls back
+        to the constant-velocity prediction when flow is unreliable.
+        """
+        gray = self._gray(frame)
+        prev = self._prev_gray
+        self._prev_gray = gray
+        if prev is None or prev.shape != gray.shape:
+            self.lost = True
+            return
+
+        s = self.flow_scale
+        h, w = gray.shape[:2]
+        lost_tracks = 0
+        for track in self.tracks:
+            predicted = track.predict().copy()
+            x1, y1, x2, y2 = (np.clip(track.box * s, 0, [w, h, w, h])).astype(int)
+            if x2 - x1 < 4 or y2 - y1 < 4:
+                lost_tracks += 1
+                continue
+            mask = np.zeros_like(prev)
+            mask[y1:y2, x1:x2] = 255
+            points = cv2.goodFeaturesToTrack(prev, maxCorners=20, qualityLevel=0.01, minDistance=3, mask=mask)
+            if points is None:
+                lost_tracks += 1
+                continue
+            moved, status, _ = cv2.calcOpticalFlowPyrLK(prev, gray, points, None, winSize=(15, 15), maxLevel=2)
+            good = status.reshape(-1) == 1
+            if good.sum() < 3:
+                lost_tracks += 1
+                continue
+            dx, dy = np.median((moved[good] - points[good]).reshape(-1, 2), axis=0) / s
+            # Flow moves the previous box; prediction already added velocity once
+            measured = predicted - track.velocity + np.array([dx, dy, dx, dy], dtype=np.float32)
+            track.correct(measured)
+
+        # Ask for a keyframe once most tracks can no longer be followed
+        self.lost = bool(self.tracks) and lost_tracks * 2 > len(self.tracks)
+
+    def detections(self, frame_shape):
+        """Confirmed tracks as Detections (clipped to the frame) plus their track ids"""
+        h, w = frame_shape[:2]
+        # Tracks missed at the last keyframe are kept for re-association but not reported
+        tracks = [t for t in self.tracks if t.misses == 0]
+        if not tracks:
+            return Detections(names=self.names), []
+        boxes = np.clip(np.array([t.box for t in tracks]), 0, [w, h, w, h])
+        detections = Detections(
+            boxes,
+            [t.score for t in tracks],
+            [t.class_id for t in tracks],
+            [t.source for t in tracks],
+            self.names
+        )
+        return detections, [t.track_id for t in tracks]
+
+
+class TrackedDetector:
+    def __init__(self, detector, keyframe_interval=TRACKER_KEYFRAME_INTERVAL):
+        """
+        Drop-in wrapper around ObjectDetector.detect_with_doors that only runs
+        the full model on keyframes and tracks objects in between
+        Args:
+            detector: ObjectDetector
+            keyframe_interval: Run the full detector every N frames
+        """
+        self.detector = detector
+        self.keyframe_interval = keyframe_interval
+        self.tracker = ObjectTracker()
+        self.track_ids = []
+        self._frames_since_keyframe = None
+
+    def detect_with_doors(self, frame):
+        """Same contract as ObjectDetector.detect_with_doors"""
+        due = (self._frames_since_keyframe is None
+               or self._frames_since_keyframe + 1 >= self.keyframe_interval
+               or self.tracker.lost)
+
+        if due:
+            detections, _ = self.detector.detect_with_doors(frame)
+            self.tracker.update(frame, detections)
+            self._frames_since_keyframe = 0
+        else:
+            self.tracker.propagate(frame)
+            self._frames_since_keyframe += 1
+
+        detections, self.track_ids = self.tracker.detections(frame.shape)
+        annotated_frame = frame.copy()
+        for (label, bbox), track_id, score, source in zip(
+                detections, self.track_ids, detections.scores.tolist(), detections.sources.tolist()):
+            color = (255, 0, 0) if source == SOURCE_DOOR else (0, 255, 0)
+            draw_bounding_box(annotated_frame, bbox, f"{label} #{track_id}", score, color=color)
+        return detections, annotated_frame
+
+    def get_frame(self):
+        return self.detector.get_frame()
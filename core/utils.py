@@ -126,18 +126,19 @@ def calculate_angle_from_center(bbox, frame_width):
 def generate_object_query_response(object_name, detections, frame_width, frame_height):
     """Generate response for object queries"""
     from core.config import NON_DETECTABLE_OBJECTS
+    from core.detections import Detections
     if object_name.lower() in NON_DETECTABLE_OBJECTS:
         return f"Sorry, I cannot detect {object_name}s."
-    matches = []
-    for label, bbox in detections:
-        if object_name.lower() in label.lower() or label.lower() in object_name.lower():
-            direction, distance = get_position_info(bbox, frame_width, frame_height)
-            angle = calculate_angle_from_center(bbox, frame_width)
-            matches.append((label, direction, distance, angle))
+    detections = Detections.from_list(detections)
+    found = detections.select(detections.match(object_name))
+    # Positions for every match in one vectorized pass
+    distances = found.distance_categories(frame_width, frame_height).tolist()
+    angles = found.angles_from_center(frame_width).tolist()
+    matches = list(zip(found.labels, distances, angles))
     if not matches:
         return f"I don't see any {object_name} nearby."
     if len(matches) == 1:
-        label, direction, distance, angle = matches[0]
+        label, distance, angle = matches[0]
         if angle > 0:
             angle_desc = f"{angle} degrees to your right"
         elif angle < 0:
@@ -147,7 +148,7 @@ def generate_object_query_response(object_name, detections, frame_width, frame_h
         return f"Yes, I see a {label} at {angle_desc}, {distance}."
     else:
         responses = []
-        for label, direction, distance, angle in matches:
+        for label, distance, angle in matches:
             if angle > 0:
                 angle_desc = f"{angle} degrees right"
             elif angle < 0:
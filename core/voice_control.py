@@ -1,71 +1,115 @@
 """
 Voice Command Recognition Module for Vision Assistant (OPTIMIZED)
 Faster response + Better voice pickup
+One persistent audio stream, captured on its own thread into a ring buffer,
+is segmented by voice-activity detection and fed to a pluggable recognizer
 """
 
-import speech_recognition as sr
+from core.audio_input import AudioCapture, MicrophoneSource, Segmenter, make_vad
+from core.recognizers import make_recognizer
 
 # Optimized defaults if config not available
 try:
-    from core.config import VOICE_ENERGY_THRESHOLD, VOICE_TIMEOUT, VOICE_PHRASE_LIMIT
+    from core.config import (
+        VOICE_ENERGY_THRESHOLD, VOICE_TIMEOUT, VOICE_BACKEND, VOICE_CALIBRATION_SECONDS, VOICE_CHUNK_MS
+    )
 except ImportError:
     VOICE_ENERGY_THRESHOLD = 300  # Much lower for better sensitivity
     VOICE_TIMEOUT = 3             # Faster timeout
-    VOICE_PHRASE_LIMIT = 3        # Shorter phrases
+    VOICE_BACKEND = "google"
+    VOICE_CALIBRATION_SECONDS = 0.5
+    VOICE_CHUNK_MS = 30
 
 
 class VoiceController:
-    def __init__(self, energy_threshold=VOICE_ENERGY_THRESHOLD):
-        print(f"Initializing VoiceController (threshold={energy_threshold})")
-        self.recognizer = sr.Recognizer()
-        
-        # OPTIMIZATION 1: Lower threshold for better voice pickup
-        self.recognizer.energy_threshold = energy_threshold
-        
-        # OPTIMIZATION 2: Enable dynamic threshold adjustment
-        self.recognizer.dynamic_energy_threshold = True
-        
-        # OPTIMIZATION 3: Reduce pause threshold for faster response
-        self.recognizer.pause_threshold = 0.5  # Was 0.8 by default
-        
-        # OPTIMIZATION 4: Initialize microphone once
-        self.microphone = sr.Microphone()
-        
-        # OPTIMIZATION 5: Calibrate once at startup (not every listen)
-        print("Calibrating microphone...")
-        with self.microphone as source:
-            self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-        print(f"✅ Calibrated (threshold: {self.recognizer.energy_threshold})")
+    def __init__(self, energy_threshold=VOICE_ENERGY_THRESHOLD, backend=VOICE_BACKEND, audio_source=None):
+        """
+        Args:
+            energy_threshold: Minimum RMS level for the energy VAD
+            backend: Recognizer backend name ('google' or 'vosk')
+            audio_source: Object with read() -> chunk bytes (None at end); defaults to the microphone
+        """
+        print(f"Initializing VoiceController (backend={backend}, threshold={energy_threshold})")
+        self.recognizer = make_recognizer(backend)
+
+        # OPTIMIZATION 1: Open the microphone once; a capture thread keeps reading it into
+        # a ring buffer so speech between listen() calls is not lost
+        self.source = audio_source if audio_source is not None else MicrophoneSource()
+        self.capture = AudioCapture(self.source)
+        self.exhausted = False
+        self._draining = False
+
+        # OPTIMIZATION 2: VAD-based segmentation with a short pause threshold
+        self.vad = make_vad()
+        if hasattr(self.vad, "threshold"):
+            self.vad.threshold = energy_threshold
+        self.segmenter = Segmenter(self.vad)
+
+        # OPTIMIZATION 3: Calibrate once at startup (not every listen)
+        if audio_source is None:
+            print("Calibrating microphone...")
+            chunks = int(VOICE_CALIBRATION_SECONDS * 1000 / VOICE_CHUNK_MS)
+            self.vad.calibrate([c for c in (self.capture.read() for _ in range(chunks)) if c])
+            print(f"✅ Calibrated (threshold: {getattr(self.vad, 'threshold', 'webrtc')})")
+
+    def _read(self):
+        chunk = self.capture.read()
+        if chunk is None:
+            self.exhausted = True
+        return chunk
 
     def listen(self):
         """Listens for a command and returns recognized text, or None if failed"""
-        with self.microphone as source:
-            print("🎤 Listening...")  # Shorter message
-            try:
-                # Listen with optimized settings
-                audio = self.recognizer.listen(
-                    source, 
-                    timeout=VOICE_TIMEOUT,           # Faster timeout
-                    phrase_time_limit=VOICE_PHRASE_LIMIT  # Shorter phrases
-                )
-            except sr.WaitTimeoutError:
-                return None  # Silent fail for speed
-            except Exception as e:
-                print(f"⚠️ Mic error: {e}")
-                return None
-
-        # Recognize speech
+        print("🎤 Listening...")  # Shorter message
+        # Timeout counted in audio chunks so recorded files behave like the live mic
+        remaining = int(VOICE_TIMEOUT * 1000 / VOICE_CHUNK_MS)
         try:
-            text = self.recognizer.recognize_google(audio)
+            while True:
+                chunk = self._read()
+                if chunk is None:
+                    break
+                event, audio = self.segmenter.push(chunk)
+                if self._draining:
+                    # Rest of a phrase whose command already fired
+                    self._draining = event not in ("end", None)
+                    continue
+                if event is None:
+                    remaining -= 1
+                    if remaining <= 0:
+                        return None  # Silent fail for speed
+                    continue
+                if event == "start":
+                    self.recognizer.start()
+                text = None
+                for piece in audio:
+                    text = text or self.recognizer.feed(piece)
+                if text:
+                    # Fired before the end of the phrase
+                    self._draining = event != "end"
+                    return self._result(text)
+                if event == "end":
+                    return self._result(self.recognizer.finish())
+            # Source ran out mid-phrase (end of a WAV file)
+            if self.segmenter.in_speech and not self._draining:
+                self.segmenter.reset()
+                return self._result(self.recognizer.finish())
+        except Exception as e:
+            print(f"⚠️ Mic error: {e}")
+        return None
+
+    @staticmethod
+    def _result(text):
+        if text:
             print(f"✅ '{text}'")  # Shorter output
             return text.lower()
-        except sr.UnknownValueError:
-            return None  # Silent fail for speed
-        except sr.RequestError as e:
-            print(f"❌ Network error: {e}")
-            return None
-        except Exception:
-            return None
+        return None
+
+    def set_vocabulary(self, extra_objects):
+        """Let the recognizer hear extra object names (the detector's classes, known after startup)"""
+        self.recognizer.set_vocabulary(extra_objects)
+
+    def close(self):
+        self.capture.close()
 
 
 # Test the module
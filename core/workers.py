@@ -0,0 +1,366 @@
+"""
+Worker Process Module for Vision Assistant
+Runs detection, OCR and emotion models in separate processes so they are not bound by
+one GIL. Frames travel through preallocated shared-memory slots instead of being pickled;
+only the small results (and an annotated frame, written back into the same slot) return.
+"""
+
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+
+import numpy as np
+from core.config import (
+    WORKER_MAX_FRAME_SHAPE, WORKER_SLOTS_PER_WORKER, WORKER_TORCH_THREADS,
+    WORKER_CPU_AFFINITY, WORKER_START_TIMEOUT, WORKER_CALL_TIMEOUT,
+    DETECTION_WORKERS, OCR_WORKERS, EMOTION_WORKERS
+)
+from core.ocr import TextReader
+from core.emotion_detection import EmotionDetector
+
+_IN_SLOT = "__frame_in_slot__"  # Placeholder for a result array written back into the slot
+
+
+# --- Worker side (runs in the child process) -------------------------------
+
+
+def _build_detection():
+    from core.detection import ObjectDetector
+    detector = ObjectDetector(use_camera=False)
+    return detector, {"class_names": detector.class_names}
+
+
+def _build_ocr():
+    return TextReader(), {}
+
+
+def _build_emotion():
+    return EmotionDetector(use_camera=False), {}
+
+
+_FACTORIES = {"detection": _build_detection, "ocr": _build_ocr, "emotion": _build_emotion}
+
+
+def _limit_threads(threads, cpus):
+    """Pin this process to cpus and cap its math-library thread pools"""
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    if cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+    import cv2
+    cv2.setNumThreads(threads)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+
+def _store_frames(result, slot):
+    """Move full-size arrays in a tuple result into the slot so they are not pickled"""
+    if not isinstance(result, tuple):
+        return result
+    stored = False
+    items = []
+    for item in result:
+        if not stored and isinstance(item, np.ndarray) and item.dtype == np.uint8 and item.nbytes <= slot.size:
+            np.ndarray(item.shape, np.uint8, buffer=slot.buf)[...] = item
+            items.append((_IN_SLOT, item.shape))
+            stored = True
+        else:
+            items.append(item)
+    return tuple(items)
+
+
+def _worker_main(kind, slot_names, tasks, results, threads, cpus):
+    _limit_threads(threads, cpus)
+    try:
+        instance, info = _FACTORIES[kind]()
+    except Exception as e:
+        results.put(("ready", False, repr(e)))
+        return
+    results.put(("ready", True, info))
+    slots = [shared_memory.SharedMemory(name=name) for name in slot_names]
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            task_id, slot_index, shape, method, args, kwargs = task
+            slot = slots[slot_index]
+            frame = np.ndarray(shape, np.uint8, buffer=slot.buf)
+            try:
+                result = getattr(instance, method)(frame, *args, **kwargs)
+                del frame  # The slot may now be overwritten with the result frame
+                results.put((task_id, True, _store_frames(result, slot)))
+            except Exception as e:
+                results.put((task_id, False, repr(e)))
+    finally:
+        for slot in slots:
+            slot.close()
+
+
+# --- Parent side -----------------------------------------------------------
+
+
+def _split_cpus(cpus, workers):
+    """Disjoint CPU sets per worker (round-robin when there are more workers than CPUs)"""
+    if not cpus:
+        return [None] * workers
+    if workers >= len(cpus):
+        return [[cpus[i % len(cpus)]] for i in range(workers)]
+    return [cpus[i::workers] for i in range(workers)]
+
+
+class WorkerPool:
+    def __init__(self, kind, workers=1, threads=WORKER_TORCH_THREADS, cpus=None,
+                 slots_per_worker=WORKER_SLOTS_PER_WORKER, max_shape=WORKER_MAX_FRAME_SHAPE):
+        """
+        Args:
+            kind: 'detection', 'ocr' or 'emotion'
+            workers: Number of processes (each loads its own model)
+            threads: Math-library threads per process
+            cpus: CPU ids shared out among the workers (None = no pinning)
+            slots_per_worker: Shared-memory frame slots per worker (requests in flight)
+            max_shape: Largest uint8 frame a slot holds
+        """
+        self.kind = kind
+        self.max_bytes = int(np.prod(max_shape))
+        self._slots = [shared_memory.SharedMemory(create=True, size=self.max_bytes)
+                       for _ in range(workers * slots_per_worker)]
+        self._free = queue.Queue()
+        for index in range(len(self._slots)):
+            self._free.put(index)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self.error = None  # Set once a worker has died; the pool accepts no more work
+
+        # spawn: forking a process that already runs torch / capture threads is unsafe
+        ctx = mp.get_context("spawn")
+        self._tasks = ctx.Queue()
+        self._results = ctx.Queue()
+        names = [slot.name for slot in self._slots]
+        self._processes = [
+            ctx.Process(target=_worker_main, name=f"{kind}-worker-{i}", daemon=True,
+                        args=(kind, names, self._tasks, self._results, threads, worker_cpus))
+            for i, worker_cpus in enumerate(_split_cpus(cpus, workers))
+        ]
+        for process in self._processes:
+            process.start()
+        try:
+            self.info = self._wait_ready(workers)
+        except Exception:
+            self.close()
+            raise
+        self.running = True
+        self._collector = threading.Thread(target=self._collect_loop, daemon=True)
+        self._collector.start()
+        print(f"✅ {workers} {kind} worker process(es) ready")
+
+    def _wait_ready(self, workers):
+        info = {}
+        deadline = time.monotonic() + WORKER_START_TIMEOUT
+        ready = 0
+        while ready < workers:
+            try:
+                _, ok, payload = self._results.get(timeout=1.0)
+            except queue.Empty:
+                # A worker that crashed while importing never reports back
+                if any(not p.is_alive() for p in self._processes):
+                    raise RuntimeError(f"{self.kind} worker exited during startup")
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"{self.kind} workers did not start in {WORKER_START_TIMEOUT}s")
+                continue
+            if not ok:
+                raise RuntimeError(f"{self.kind} worker failed to start: {payload}")
+            info = payload
+            ready += 1
+        return info
+
+    def submit(self, method, frame, *args, **kwargs):
+        """Run instance.method(frame, *args, **kwargs) in a worker; returns a Future"""
+        frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        if frame.nbytes > self.max_bytes:
+            raise ValueError(f"Frame {frame.shape} exceeds WORKER_MAX_FRAME_SHAPE")
+        slot_index = self._take_slot()
+        np.ndarray(frame.shape, np.uint8, buffer=self._slots[slot_index].buf)[...] = frame
+        future = Future()
+        task_id = next(self._ids)
+        with self._lock:
+            if self.error is not None:
+                self._free.put(slot_index)
+                raise RuntimeError(self.error)
+            self._pending[task_id] = (future, slot_index)
+        self._tasks.put((task_id, slot_index, frame.shape, method, args, kwargs))
+        return future
+
+    def _take_slot(self):
+        """Index of a free slot; blocks while every slot is in flight, fails once a worker has died"""
+        while True:
+            if self.error is not None:
+                raise RuntimeError(self.error)
+            try:
+                return self._free.get(timeout=0.5)
+            except queue.Empty:
+                continue  # Slots of a dead pool never come back; re-check the error
+
+    def call(self, method, frame, *args, timeout=WORKER_CALL_TIMEOUT, **kwargs):
+        """submit() and wait up to timeout seconds for the result"""
+        return self.submit(method, frame, *args, **kwargs).result(timeout)
+
+    def _check_workers(self):
+        """A worker killed mid-task (OOM, segfault) never answers: fail everything in flight"""
+        dead = [p for p in self._processes if not p.is_alive()]
+        if not dead:
+            return
+        with self._lock:
+            self.error = f"{self.kind} worker {dead[0].name} exited with code {dead[0].exitcode}"
+            pending, self._pending = self._pending, {}
+        print(f"❌ {self.error}")
+        # The surviving workers may still be using these slots, so they are not reused
+        for future, _ in pending.values():
+            future.set_exception(RuntimeError(self.error))
+
+    def _collect_loop(self):
+        while self.running:
+            if self.error is None:
+                self._check_workers()
+            try:
+                task_id, ok, payload = self._results.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+            with self._lock:
+                if task_id not in self._pending:
+                    continue  # Already failed when a worker died
+                future, slot_index = self._pending.pop(task_id)
+            if ok:
+                payload = self._load_frames(payload, self._slots[slot_index])
+            self._free.put(slot_index)
+            if ok:
+                future.set_result(payload)
+            else:
+                future.set_exception(RuntimeError(f"{self.kind} worker error: {payload}"))
+
+    @staticmethod
+    def _load_frames(result, slot):
+        if not isinstance(result, tuple):
+            return result
+        return tuple(
+            np.ndarray(item[1], np.uint8, buffer=slot.buf).copy()
+            if isinstance(item, tuple) and len(item) == 2 and item[0] == _IN_SLOT else item
+            for item in result
+        )
+
+    def close(self):
+        self.running = False
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=2.0)
+            if process.is_alive():
+                process.terminate()
+        for slot in self._slots:
+            slot.close()
+            slot.unlink()
+
+
+def _pool(kind, workers):
+    return WorkerPool(kind, workers=workers, cpus=WORKER_CPU_AFFINITY.get(kind))
+
+
+class RemoteDetector:
+    """ObjectDetector interface backed by detection worker processes"""
+
+    def __init__(self, frame_source, workers=DETECTION_WORKERS):
+        self.pool = _pool("detection", workers)
+        self.class_names = self.pool.info["class_names"]
+        self.frame_source = frame_source
+
+    def detect(self, frame):
+        return self.pool.call("detect", frame)
+
+    def detect_with_doors(self, frame, door_rois=None):
+        return self.pool.call("detect_with_doors", frame, door_rois)
+
+    def get_frame(self):
+        return self.frame_source.read()
+
+    def release(self):
+        self.pool.close()
+
+
+class RemoteTextReader:
+    """TextReader interface backed by OCR worker processes"""
+
+    format_text_output = TextReader.format_text_output
+
+    def __init__(self, workers=OCR_WORKERS):
+        self.pool = _pool("ocr", workers)
+
+    def read_text(self, frame, *args, **kwargs):
+        return self.pool.call("read_text", frame, *args, **kwargs)
+
+    def read_region(self, crop, *args, **kwargs):
+        return self.pool.call("read_region", crop, *args, **kwargs)
+
+    def release(self):
+        self.pool.close()
+
+
+class RemoteEmotionDetector:
+    """EmotionDetector interface backed by emotion worker processes"""
+
+    annotate_frame = EmotionDetector.annotate_frame
+    annotate_faces = EmotionDetector.annotate_faces
+
+    def __init__(self, frame_source, workers=EMOTION_WORKERS):
+        self.pool = _pool("emotion", workers)
+        self.frame_source = frame_source
+
+    def get_frame(self):
+        return self.frame_source.read()
+
+    def detect_emotions(self, frame, person_boxes=None):
+        return self.pool.call("detect_emotions", frame, person_boxes)
+
+    def detect_emotion(self, frame, person_boxes=None):
+        return self.pool.call("detect_emotion", frame, person_boxes)
+
+    def analyze_full_frame(self, frame):
+        return self.pool.call("analyze_full_frame", frame)
+
+    def release(self):
+        self.pool.close()
+
+
+# Benchmark: passing a camera frame through shared memory vs. pickling it
+if __name__ == "__main__":
+    import pickle
+
+    frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+    slot = shared_memory.SharedMemory(create=True, size=frame.nbytes)
+    try:
+        n = 500
+        start = time.perf_counter()
+        for _ in range(n):
+            pickle.loads(pickle.dumps(frame))
+        pickle_us = (time.perf_counter() - start) / n * 1e6
+
+        start = time.perf_counter()
+        for _ in range(n):
+            np.ndarray(frame.shape, np.uint8, buffer=slot.buf)[...] = frame
+            np.ndarray(frame.shape, np.uint8, buffer=slot.buf)  # Worker-side view: no copy
+        shm_us = (time.perf_counter() - start) / n * 1e6
+    finally:
+        slot.close()
+        slot.unlink()
+    print(f"{frame.nbytes / 1024:.0f} KB frame: pickle round trip {pickle_us:.0f} µs "
+          f"(plus queue pipe transfer), shared-memory slot {shm_us:.0f} µs")
@@ -0,0 +1,140 @@
+"""
+Headless Inference Service for Vision Assistant
+HTTP endpoints for detection (with spoken positions), OCR and emotion on uploaded images;
+no camera, window or speech. Concurrent detection requests share micro-batched model calls.
+
+Run with threads in a single process so requests can be batched together:
+    python service.py
+    gunicorn --workers 1 --threads 16 --bind 0.0.0.0:5002 service:app
+
+Images are sent as a multipart 'image' file or as the raw request body (JPEG/PNG).
+"""
+
+import threading
+import time
+
+import cv2
+import numpy as np
+from flask import Flask, jsonify, request
+
+from core.batching import MicroBatcher
+from core.config import (
+    SERVICE_PORT, SERVICE_MAX_BATCH, SERVICE_REQUEST_TIMEOUT,
+    SERVICE_MAX_IMAGE_BYTES, OCR_PREPROCESS
+)
+from core.detection import ObjectDetector
+from core.startup import LazySubsystem
+from core.utils import generate_spatial_description
+
+app = Flask(__name__)
+app.config["MAX_CONTENT_LENGTH"] = SERVICE_MAX_IMAGE_BYTES
+
+detector = ObjectDetector(use_camera=False)
+detection_batcher = MicroBatcher(detector.detect_batch_with_doors, max_batch=SERVICE_MAX_BATCH)
+
+
+def _load_text_reader():
+    from core.ocr import TextReader
+    return TextReader()
+
+
+def _load_emotion_detector():
+    from core.emotion_detection import EmotionDetector
+    return EmotionDetector(use_camera=False)
+
+
+# OCR and emotion models load on first use; each is called one request at a time
+text_reader = LazySubsystem("TextReader", _load_text_reader)
+emotion_detector = LazySubsystem("EmotionDetector", _load_emotion_detector)
+_ocr_lock = threading.Lock()
+_emotion_lock = threading.Lock()
+
+
+class BadImage(Exception):
+    pass
+
+
+@app.errorhandler(BadImage)
+def bad_image(e):
+    return jsonify({"error": str(e)}), 400
+
+
+def _request_image():
+    """Decode the uploaded image (multipart 'image' field or raw body) to a BGR frame"""
+    upload = request.files.get("image")
+    data = upload.read() if upload is not None else request.get_data()
+    if not data:
+        raise BadImage("No image supplied")
+    frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        raise BadImage("Could not decode image")
+    return frame
+
+
+def _detect(frame):
+    return detection_batcher(frame, timeout=SERVICE_REQUEST_TIMEOUT)[0]
+
+
+def _detections_json(detections, width, height):
+    directions = detections.directions(width).tolist()
+    distances = detections.distance_categories(width, height).tolist()
+    angles = detections.angles_from_center(width).tolist()
+    return [
+        {"label": label, "confidence": round(score, 3), "bbox": [round(v, 1) for v in bbox],
+         "direction": direction, "distance": distance, "angle": angle}
+        for (label, bbox), score, direction, distance, angle
+        in zip(detections, detections.scores.tolist(), directions, distances, angles)
+    ]
+
+
+@app.route("/health")
+def health():
+    return jsonify({"status": "ok", "detection_batching": detection_batcher.stats(),
+                    "ocr_loaded": text_reader.loaded, "emotion_loaded": emotion_detector.loaded})
+
+
+@app.route("/detect", methods=["POST"])
+def detect():
+    frame = _request_image()
+    t0 = time.perf_counter()
+    detections = _detect(frame)
+    h, w = frame.shape[:2]
+    return jsonify({
+        "width": w,
+        "height": h,
+        "detections": _detections_json(detections, w, h),
+        "description": generate_spatial_description(detections.spatial_info(w, h)),
+        "latency_ms": round((time.perf_counter() - t0) * 1000, 1),
+    })
+
+
+@app.route("/ocr", methods=["POST"])
+def ocr():
+    frame = _request_image()
+    t0 = time.perf_counter()
+    with _ocr_lock:
+        texts, _ = text_reader.read_text(frame, preprocess=OCR_PREPROCESS)
+        speech = text_reader.format_text_output(texts)
+    return jsonify({"texts": texts, "speech": speech,
+                    "latency_ms": round((time.perf_counter() - t0) * 1000, 1)})
+
+
+@app.route("/emotion", methods=["POST"])
+def emotion():
+    frame = _request_image()
+    t0 = time.perf_counter()
+    # Person boxes from the (batched) detector narrow the face search
+    detections = _detect(frame)
+    person_boxes = detections.select(detections.match("person")).boxes.tolist()
+    with _emotion_lock:
+        faces = emotion_detector.detect_emotions(frame, person_boxes or None)
+    return jsonify({
+        "faces": [{"box": [int(v) for v in face["box"]], "emotion": face["emotion"],
+                   "scores": {k: round(float(v), 2) for k, v in face["scores"].items()}}
+                  for face in faces],
+        "latency_ms": round((time.perf_counter() - t0) * 1000, 1),
+    })
+
+
+if __name__ == "__main__":
+    app.run(host="0.0.0.0", port=SERVICE_PORT, threaded=True)
@@ -1,25 +1,81 @@
-from flask import Flask, render_template, jsonify, send_file
+import json
+
+from flask import Flask, Response, render_template, jsonify, request, stream_with_context
+
+from core.config import WEB_KEEPALIVE_SECONDS
+from core.log_tail import LogTail
+from core.frame_stream import FrameWatcher
 
 app = Flask(__name__)
 
+# One thread follows web_output.log; every client is served from its in-memory history
+log_tail = LogTail()
+# One thread reloads the app's published frame; every viewer shares the same encoded bytes
+frame_watcher = FrameWatcher()
+
+
+def _cursor_arg(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
 @app.route("/")
 def index():
     return render_template("index.html")
 
 @app.route("/web_output")
 def web_output():
-    try:
-        with open("web_output.log", "r") as f:
-            data = f.read()
-    except FileNotFoundError:
-        data = "No output yet!"
-    return jsonify({"output": data})
+    # ?offset=<cursor from the previous response> returns only what was logged since then
+    text, cursor, reset = log_tail.since(_cursor_arg(request.args.get("offset")))
+    if reset and not text:
+        text = "No output yet!"
+    return jsonify({"output": text, "offset": cursor, "reset": reset})
+
+@app.route("/stream")
+def stream():
+    """Server-Sent Events: 'reset' with the retained history, then 'append' with new text"""
+    cursor = _cursor_arg(request.headers.get("Last-Event-ID") or request.args.get("offset"))
+
+    def events(cursor):
+        text, cursor, reset = log_tail.since(cursor)
+        while True:
+            if text or reset:
+                yield f"id: {cursor}\nevent: {'reset' if reset else 'append'}\ndata: {json.dumps(text)}\n\n"
+            else:
+                yield ": keepalive\n\n"
+            text, cursor, reset = log_tail.wait(cursor, WEB_KEEPALIVE_SECONDS)
+
+    return Response(stream_with_context(events(cursor)), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 @app.route("/vision_image")
 def vision_image():
-    # For now, just return the last static image (replace with frame.jpg or any dynamic output)
-    return send_file("image.jpg", mimetype="image/jpeg")
+    """Latest published frame (image.jpg until the app publishes one), revalidated by ETag"""
+    jpeg, etag, _ = frame_watcher.latest()
+    if jpeg is None:
+        return Response("No frame available", status=404)
+    response = Response(status=304) if etag in request.if_none_match \
+        else Response(jpeg, mimetype="image/jpeg")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
-if __name__ == "__main__":
-    app.run(debug=True, port=5001)
+@app.route("/video_feed")
+def video_feed():
+    """MJPEG stream: each new published frame is pushed to the client as it appears"""
+    def frames():
+        jpeg, _, seq = frame_watcher.latest()
+        while True:
+            if jpeg is not None:
+                yield (b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: "
+                       + str(len(jpeg)).encode() + b"\r\n\r\n" + jpeg + b"\r\n")
+            # On timeout the same frame is re-sent, which also keeps idle connections open
+            jpeg, _, seq = frame_watcher.wait(seq, WEB_KEEPALIVE_SECONDS)
+
+    return Response(stream_with_context(frames()), mimetype="multipart/x-mixed-replace; boundary=frame",
+                    headers={"Cache-Control": "no-cache"})
 
+if __name__ == "__main__":
+    app.run(debug=True, port=5001, threaded=True)